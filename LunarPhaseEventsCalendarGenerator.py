@@ -1,16 +1,65 @@
 import os
 import logging
-from datetime import datetime
-from skyfield.api import load_file, load
-from skyfield import almanac
-from ics import Calendar, Event
+from datetime import datetime, timedelta, timezone as dt_timezone
 import argparse
-import pytz
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import shutil
+import sqlite3
+import time
+import uuid
 
 # Directory for output files
 OUTPUT_DIR = "output"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Ephemeris data file
+EPHEMERIS_FILE = "de440s.bsp"
+
+# Ephemeris hash memo and per-span excerpts of the ephemeris
+EPHEMERIS_HASH_FILE = os.path.join(OUTPUT_DIR, "ephemeris_hash.json")
+EPHEMERIS_EXCERPT_DIR = os.path.join(OUTPUT_DIR, "ephemeris_excerpts")
+# SPK targets needed for Moon phases: Earth-Moon barycenter, Sun, Moon and Earth,
+# plus the planet barycenters for apparent()'s light deflection and void-of-course aspects
+EXCERPT_TARGETS = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 301, 399)
+EXCERPT_VERSION = 2                  # Bump when EXCERPT_TARGETS changes, so older excerpts are not reused
+EXCERPT_PADDING_DAYS = 32            # Extra days kept on each side of the excerpted years
+EXCERPT_BLOCK_YEARS = 10             # Excerpts cover whole blocks of years so nearby spans share one
+EXCERPT_MAX_FILES = 16               # Excerpts kept before the least recently used are deleted
+
+# Phase-event cache
+CACHE_FILE = os.path.join(OUTPUT_DIR, "phase_cache.sqlite")
+
+# ICS serialization
+ICS_PRODID = "-//Jthora//Lunar Phase Events Calendar Generator//EN"
+ICS_UID_NAMESPACE = "lunarPhaseEventsCalendarGenerator"
+ICS_UID_DOMAIN = "lunar-phase-events"
+ICS_LINE_OCTETS = 75
+
+# Columnar event store: one .npy file per column plus meta.json
+EVENT_STORE_DIR = os.path.join(OUTPUT_DIR, "lunar_phase_events")
+EVENT_STORE_VERSION = 1
+EVENT_STORE_COLUMNS = {
+    "utc_us": "<i8",               # UTC microseconds since the Unix epoch
+    "phase": "i1",                 # EVENT_NAMES index: a MOON_PHASES or EXTRA_EVENTS type
+    "longitude": "<f8",            # Apparent ecliptic longitude in degrees
+    "corrected_longitude": "<f8",  # Longitude after the ayanamsa correction (if any)
+    "sign": "i1",                  # ZODIAC_SIGNS index, -1 if unknown
+}
+
+# Output manifest used for incremental regeneration
+MANIFEST_FILE = os.path.join(OUTPUT_DIR, "manifest.json")
+MANIFEST_VERSION = 1
+OUTPUT_FORMAT_VERSION = 1  # Bump when a code change alters the ICS output
+
+# Run summary and profiling output
+SUMMARY_FILE = os.path.join(OUTPUT_DIR, "run_summary.json")
+PROFILE_REPORT_LINES = 40
+RUN_COUNTERS = ("events_calculated", "events_cached", "events_written", "calendars_skipped", "unknown_zodiac", "errors")
+
 # Logging setup
 LOG_FILE = os.path.join(OUTPUT_DIR, "lunar_phase_generator_error.log")
 logging.basicConfig(filename=LOG_FILE, level=logging.ERROR, format='%(asctime)s - %(message)s')
@@ -83,10 +132,164 @@ ZODIAC_SIGNS = [
      "Mutable Water ● 💧\nThe Moon in Pisces enhances intuition, dreaminess, and compassion. This is a time for creativity, spiritual exploration, and connecting with the deeper currents of emotion. Pisces’ watery energy promotes empathy and imagination but may also bring escapism or confusion.")
 ]
 
+# Event text templates per MOON_PHASES index, filled with str.format using these fields
+TEMPLATE_FIELDS = (
+    "phase_name", "cultural_name", "cultural_title", "cultural_significance", "month_name",
+    "zodiac_name", "zodiac_emoji", "zodiac_description", "alignment",
+)
+ZODIAC_DESCRIPTION_TEMPLATE = (
+    "Zodiac: {zodiac_name} {zodiac_emoji}\n"
+    "Alignment: {alignment}\n\n"
+    "Description: {zodiac_description}"
+)
+DEFAULT_SUMMARY_TEMPLATE = "{phase_name}{cultural_title} {zodiac_emoji}"
+DEFAULT_DESCRIPTION_TEMPLATE = (
+    "The {phase_name} occurs as part of the lunar cycle. "
+    "It represents a transition toward the next phase of the Moon."
+)
+PHASE_DESCRIPTION_TEMPLATES = {
+    0: (
+        "The New Moon marks the beginning of the lunar cycle.\n\n"
+        "The Moon is positioned between the Earth and the Sun, making it invisible from Earth.\n\n"
+        "Significance: A time for setting intentions and new beginnings.\n\n"
+        "Meaning: Represents a fresh start, reflection, and inward focus.\n\n"
+        + ZODIAC_DESCRIPTION_TEMPLATE
+    ),
+    1: (
+        "The First Quarter Moon occurs when half the Moon is illuminated, and the other half remains dark.\n\n"
+        "This phase is a time of action, decisions, and challenges as you work toward your goals.\n\n"
+        "Significance: Represents a period of growth and progress in many traditions.\n\n"
+        "Meaning: A time to confront obstacles and make important choices, paving the way for success.\n\n"
+        + ZODIAC_DESCRIPTION_TEMPLATE
+    ),
+    2: (
+        "The Full Moon occurs when the Moon is fully illuminated by the Sun, marking the midpoint of the lunar cycle.\n\n"
+        "This Full Moon is traditionally called the '{cultural_name} Moon' for the month of "
+        "{month_name}. {cultural_significance}\n\n"
+        "Significance: A time of culmination, celebration, and achieving clarity.\n\n"
+        "Meaning: A time of heightened emotions, clarity, and reflection.\n\n"
+        + ZODIAC_DESCRIPTION_TEMPLATE
+    ),
+    3: (
+        "The Third Quarter Moon occurs when half the Moon is illuminated as it wanes toward the New Moon.\n\n"
+        "This phase symbolizes release, reflection, and preparation for the next cycle.\n\n"
+        "Significance: Often associated with closure and letting go of what no longer serves you.\n\n"
+        "Meaning: A period of introspection, evaluation, and setting the stage for new beginnings.\n\n"
+        + ZODIAC_DESCRIPTION_TEMPLATE
+    ),
+}
+FULL_MOON_PHASE = 2
+
+# Extended event types, numbered after the MOON_PHASES indices so they share the
+# phase-event rows, cache, event store, templates and ICS writer with the phases
+EXTRA_EVENT_VERSION = 2  # Bump when extended events are calculated differently, so cached ones are recalculated
+MOON_INGRESS_EVENTS = {True: 4, False: 13}  # Keyed by galacticCenter_on; ingresses are found under both alignments
+MOON_VOID_OF_COURSE_EVENTS = {True: 14, False: 15}  # Keyed like MOON_INGRESS_EVENTS, as each ends at an ingress
+LUNAR_ECLIPSE_EVENTS = {"Penumbral": 5, "Partial": 6, "Total": 7}  # Keyed by Skyfield's LUNAR_ECLIPSES names
+SOLAR_ECLIPSE_EVENTS = {"Partial": 8, "Annular": 9, "Total": 10}
+LUNAR_PERIGEE = 11
+LUNAR_APOGEE = 12
+EXTRA_EVENTS = {
+    MOON_INGRESS_EVENTS[True]: "🌙 Moon Ingress (Galactic Center)",
+    5: "🌕 Penumbral Lunar Eclipse",
+    6: "🌕 Partial Lunar Eclipse",
+    7: "🌕 Total Lunar Eclipse",
+    8: "🌑 Partial Solar Eclipse",
+    9: "🌑 Annular Solar Eclipse",
+    10: "🌑 Total Solar Eclipse",
+    LUNAR_PERIGEE: "🌔 Lunar Perigee",
+    LUNAR_APOGEE: "🌘 Lunar Apogee",
+    MOON_INGRESS_EVENTS[False]: "🌙 Moon Ingress (Western Occult)",
+    MOON_VOID_OF_COURSE_EVENTS[True]: "🌙 Moon Void of Course (Galactic Center)",
+    MOON_VOID_OF_COURSE_EVENTS[False]: "🌙 Moon Void of Course (Western Occult)",
+}
+EVENT_NAMES = {**MOON_PHASES, **EXTRA_EVENTS}
+EXTRA_EVENT_CHOICES = ["ingress", "eclipses", "apsides", "void_of_course"]
+
+EXTRA_EVENT_SUMMARY_TEMPLATES = {
+    MOON_INGRESS_EVENTS[True]: "🌙 Moon enters {zodiac_name} {zodiac_emoji} (Galactic Center)",
+    MOON_INGRESS_EVENTS[False]: "🌙 Moon enters {zodiac_name} {zodiac_emoji} (Western Occult)",
+    MOON_VOID_OF_COURSE_EVENTS[True]: "🌙 Moon void of course in {zodiac_name} {zodiac_emoji} (Galactic Center)",
+    MOON_VOID_OF_COURSE_EVENTS[False]: "🌙 Moon void of course in {zodiac_name} {zodiac_emoji} (Western Occult)",
+}
+# An ingress (or void-of-course) carries its own alignment rather than the run's, so its description names it
+MOON_INGRESS_DESCRIPTION_TEMPLATE = (
+    "The Moon enters {zodiac_name}, moving into a new sign about every two and a half days.\n\n"
+    "Significance: The tone of the coming days shifts with the Moon's new sign.\n\n"
+    "Meaning: A time to adjust plans and moods to the qualities of {zodiac_name}.\n\n"
+    + ZODIAC_DESCRIPTION_TEMPLATE
+)
+MOON_VOID_OF_COURSE_DESCRIPTION_TEMPLATE = (
+    "The Moon makes its last major aspect to the Sun or a planet while in {zodiac_name} "
+    "and is void of course until it enters the next sign.\n\n"
+    "Significance: Traditionally a time when new undertakings come to little.\n\n"
+    "Meaning: A time to rest, reflect, and finish what is already under way.\n\n"
+    + ZODIAC_DESCRIPTION_TEMPLATE
+)
+LUNAR_ECLIPSE_DESCRIPTION_TEMPLATE = (
+    "A {phase_name} occurs when the Full Moon passes through the Earth's shadow.\n\n"
+    "Eclipses fall near the lunar nodes, where the Moon's path crosses the ecliptic.\n\n"
+    "Significance: Traditionally seen as a powerful Full Moon that brings matters to a head.\n\n"
+    "Meaning: A time of revelation, emotional release, and endings that clear the way forward.\n\n"
+    + ZODIAC_DESCRIPTION_TEMPLATE
+)
+SOLAR_ECLIPSE_DESCRIPTION_TEMPLATE = (
+    "A {phase_name} occurs when the New Moon passes in front of the Sun, "
+    "casting its shadow on part of the Earth. The time given is that of the New Moon.\n\n"
+    "Eclipses fall near the lunar nodes, where the Moon's path crosses the ecliptic.\n\n"
+    "Significance: Traditionally seen as a powerful New Moon that opens a new chapter.\n\n"
+    "Meaning: A time of sudden beginnings, turning points, and changes of direction.\n\n"
+    + ZODIAC_DESCRIPTION_TEMPLATE
+)
+EXTRA_EVENT_DESCRIPTION_TEMPLATES = {
+    MOON_INGRESS_EVENTS[True]: MOON_INGRESS_DESCRIPTION_TEMPLATE.replace("{alignment}", "Galactic Center"),
+    MOON_INGRESS_EVENTS[False]: MOON_INGRESS_DESCRIPTION_TEMPLATE.replace("{alignment}", "Western Occult"),
+    MOON_VOID_OF_COURSE_EVENTS[True]: MOON_VOID_OF_COURSE_DESCRIPTION_TEMPLATE.replace("{alignment}", "Galactic Center"),
+    MOON_VOID_OF_COURSE_EVENTS[False]: MOON_VOID_OF_COURSE_DESCRIPTION_TEMPLATE.replace("{alignment}", "Western Occult"),
+    5: LUNAR_ECLIPSE_DESCRIPTION_TEMPLATE,
+    6: LUNAR_ECLIPSE_DESCRIPTION_TEMPLATE,
+    7: LUNAR_ECLIPSE_DESCRIPTION_TEMPLATE,
+    8: SOLAR_ECLIPSE_DESCRIPTION_TEMPLATE,
+    9: SOLAR_ECLIPSE_DESCRIPTION_TEMPLATE,
+    10: SOLAR_ECLIPSE_DESCRIPTION_TEMPLATE,
+    LUNAR_PERIGEE: (
+        "The Lunar Perigee is the point in the Moon's orbit where it is closest to the Earth.\n\n"
+        "The Moon appears slightly larger and its tides are stronger.\n\n"
+        "Significance: Often linked with heightened intensity and stronger emotional tides.\n\n"
+        "Meaning: A time when lunar influences feel close and pronounced.\n\n"
+        + ZODIAC_DESCRIPTION_TEMPLATE
+    ),
+    LUNAR_APOGEE: (
+        "The Lunar Apogee is the point in the Moon's orbit where it is farthest from the Earth.\n\n"
+        "The Moon appears slightly smaller and its tides are gentler.\n\n"
+        "Significance: Often linked with distance, perspective, and quieter emotional tides.\n\n"
+        "Meaning: A time for detachment, overview, and reflection.\n\n"
+        + ZODIAC_DESCRIPTION_TEMPLATE
+    ),
+}
+
 # Constants
 REFERENCE_POSITION = 26.854  # Galactic Center position in degrees (year 2000)
 PRECESSION_RATE = 0.01397    # Degrees per year due to precession
 REFERENCE_YEAR = 2000        # Base year for Galactic Center alignment
+HALF_MICROSECOND_DAYS = 0.5e-6 / 86400  # Rounding offset used by Skyfield's utc_datetime()
+CACHE_MAX_ENTRIES = 10000    # Year entries kept in the phase-event cache before eviction
+UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+SPAN_CHUNK_YEARS = 10        # Years covered by a single phase search (and parallel task) in span mode; chunks start at multiples of it
+
+# Extended event search
+EXTRA_EVENT_STEP_DAYS = 0.5                 # Search grid step; the Moon stays in a sign for over two days
+EVENT_EPSILON_DAYS = 0.001 / 86400          # Stop refining event times at one millisecond, as find_discrete does
+EVENT_MAX_ITERATIONS = 60
+EARTH_RADIUS_KM = 6378.137
+MOON_RADIUS_KM = 1737.4
+SUN_RADIUS_KM = 696000.0
+ECLIPSE_CLOSEST_APPROACH_FACTOR = 0.9955    # Closest Sun-Moon approach relative to their separation at New Moon
+ASPECT_BODIES = ("sun", "mercury barycenter", "venus barycenter", "mars barycenter", "jupiter barycenter",
+                 "saturn barycenter", "uranus barycenter", "neptune barycenter", "pluto barycenter")
+MAJOR_ASPECTS = (0, 60, 90, 120, 180)       # Conjunction, sextile, square, trine and opposition, in degrees
+ASPECT_STEP_DEGREES = 30                    # Every major aspect is a multiple of this separation
+VOID_OF_COURSE_PADDING_DAYS = 3.0           # Longer than the Moon's longest stay in one sign
 
 # Zodiac Signs and Degree Ranges
 ZODIAC_SIGN_DEGREE_RANGES = [
@@ -96,6 +299,72 @@ ZODIAC_SIGN_DEGREE_RANGES = [
     ('Capricorn', 270, 300), ('Aquarius', 300, 330), ('Pisces', 330, 360)
 ]
 
+# Run instrumentation: per-stage and per-year timings plus counters, summarized at the end of a run
+_run_stats = {"stages": {}, "years": {}, "counters": {}}
+
+def reset_run_stats():
+    """
+    Clear the timings and counters collected so far in this process.
+    """
+    for section in _run_stats.values():
+        section.clear()
+
+def record_stage(stage, seconds, year=None):
+    """
+    Add a stage timing to the run totals and, when given, to the year's totals.
+    """
+    total = _run_stats["stages"].setdefault(stage, {"seconds": 0.0, "calls": 0})
+    total["seconds"] += seconds
+    total["calls"] += 1
+    if year is not None:
+        year_stages = _run_stats["years"].setdefault(str(year), {})
+        year_stages[stage] = year_stages.get(stage, 0.0) + seconds
+
+@contextlib.contextmanager
+def stage_timer(stage, year=None):
+    """
+    Time the enclosed block as one call of a stage.
+    """
+    began = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - began, year)
+
+def count_event(counter, amount=1):
+    """
+    Increase a run counter.
+    """
+    _run_stats["counters"][counter] = _run_stats["counters"].get(counter, 0) + amount
+
+def run_stats_snapshot():
+    """
+    Return a copy of this process's stats that can be sent to another process.
+    """
+    return json.loads(json.dumps(_run_stats))
+
+def merge_run_stats(snapshot):
+    """
+    Fold stats collected by a worker process into this process's totals.
+    """
+    for stage, total in snapshot["stages"].items():
+        merged = _run_stats["stages"].setdefault(stage, {"seconds": 0.0, "calls": 0})
+        merged["seconds"] += total["seconds"]
+        merged["calls"] += total["calls"]
+    for year, stages in snapshot["years"].items():
+        year_stages = _run_stats["years"].setdefault(year, {})
+        for stage, seconds in stages.items():
+            year_stages[stage] = year_stages.get(stage, 0.0) + seconds
+    for counter, amount in snapshot["counters"].items():
+        count_event(counter, amount)
+
+class _ErrorCounter(logging.Handler):
+    """
+    Logging handler that counts ERROR records for the run summary.
+    """
+    def emit(self, record):
+        count_event("errors")
+
 # Fractional Year
 def fractional_year(date_str, time_str):
     date_time = datetime.strptime(f"{date_str} {time_str}", "%b %d, %Y %H:%M")
@@ -123,10 +392,363 @@ def calculate_zodiac(longitude):
     zodiac_index = int((longitude % 360) / 30)
     return ZODIAC_SIGNS[zodiac_index]
 
-def calculate_lunar_phases(year, eph, timescale, galacticCenter_on=True):
+def calculate_zodiac_indices(longitudes):
+    """
+    Determine zodiac sign indices for an array of ecliptic longitudes.
+    Invalid longitudes are marked with -1.
+    """
+    import numpy as np
+
+    longitudes = np.asarray(longitudes, dtype=float)
+    valid = (longitudes >= 0) & (longitudes < 360)
+    indices = np.full(longitudes.shape, -1, dtype=int)
+    indices[valid] = ((longitudes[valid] % 360) // 30).astype(int)
+    return indices
+
+def fractional_years(times):
+    """
+    Calculate the year plus day-of-year fraction for every instant in a Skyfield Time array.
+    """
+    # Shift by half a microsecond so the calendar day matches utc_datetime() rounding
+    year, month, day = (times + HALF_MICROSECOND_DAYS).utc[:3]
+    year_start = (year.astype(int) - 1970).astype('datetime64[Y]')
+    date = year_start.astype('datetime64[M]') + (month.astype(int) - 1)
+    date = date.astype('datetime64[D]') + (day.astype(int) - 1)
+    day_of_year = (date - year_start.astype('datetime64[D]')).astype(int) + 1
+    return year + (day_of_year / 365.25)
+
+def make_phase_events(phases, datetimes, longitudes, corrected_longitudes):
+    """
+    Build event dictionaries with zodiac details from per-event phase indices,
+    UTC datetimes and raw/corrected Moon longitudes.
+    """
+    events = []
+    zodiac_indices = calculate_zodiac_indices(corrected_longitudes)
+    for phase, phase_datetime, longitude, corrected_longitude, zodiac_index in zip(
+            phases, datetimes, longitudes, corrected_longitudes, zodiac_indices):
+        if zodiac_index < 0:
+            logging.error(f"Invalid longitude value: {corrected_longitude}")
+            count_event("unknown_zodiac")
+            zodiac_name, zodiac_emoji, zodiac_description = "Unknown", "", "No description available."
+        else:
+            zodiac_name, zodiac_emoji, zodiac_description = ZODIAC_SIGNS[zodiac_index]
+
+        events.append({
+            "datetime": phase_datetime,
+            "phase": EVENT_NAMES.get(phase, "Unknown Phase"),
+            "phase_index": int(phase),
+            "longitude": float(longitude),
+            "corrected_longitude": float(corrected_longitude),
+            "zodiac_index": int(zodiac_index),
+            "zodiac_name": zodiac_name,
+            "zodiac_emoji": zodiac_emoji,
+            "zodiac_description": zodiac_description
+        })
+
+    return events
+
+def moon_longitudes(eph, times, galacticCenter_on=True):
+    """
+    Return the Moon's apparent ecliptic longitudes and the longitudes corrected
+    with the Galactic Center ayanamsa (or the same longitudes when it is off).
+    """
+    longitudes = eph["earth"].at(times).observe(eph["moon"]).apparent().ecliptic_latlon()[1].degrees
+    if galacticCenter_on:
+        # Adjust longitudes with the Galactic Center ayanamsa for each event's fractional year
+        galacticCenter = calculate_ayanamsa(fractional_years(times))
+        return longitudes, adjust_position(longitudes, galacticCenter)
+    return longitudes, longitudes
+
+def build_phase_events(times, phases, eph, galacticCenter_on=True):
+    """
+    Map the raw phase search results to event dictionaries with zodiac details,
+    computing the Moon's position for all events in one batch.
+    """
+    if len(times) == 0:
+        return []
+
+    # Calculate Moon's position for every event at once
+    try:
+        longitudes, corrected_longitudes = moon_longitudes(eph, times, galacticCenter_on)
+    except Exception as e:
+        logging.error(f"Error calculating Moon positions: {e}", exc_info=True)
+        return []
+
+    count_event("events_calculated", len(times))
+    return make_phase_events(phases, times.utc_datetime(), longitudes, corrected_longitudes)
+
+def search_grid(start_time, end_time):
+    """
+    Return the TT Julian dates of the extended-event search grid, ending exactly at end_time.
+    """
+    import numpy as np
+
+    return np.append(np.arange(start_time.tt, end_time.tt, EXTRA_EVENT_STEP_DAYS), end_time.tt)
+
+def refine_roots(timescale, left_jd, right_jd, left_values, right_values, function):
+    """
+    Refine every bracketed root of function at once with the Illinois variant of
+    regula falsi. Each iteration is a single batched evaluation over all brackets.
+    """
+    import numpy as np
+
+    for _ in range(EVENT_MAX_ITERATIONS):
+        if len(left_jd) == 0:
+            break
+        jd = (left_jd * right_values - right_jd * left_values) / (right_values - left_values)
+        values = function(timescale.tt_jd(jd))
+        straddle = values * right_values < 0
+        left_jd, left_values = np.where(straddle, right_jd, left_jd), np.where(straddle, right_values, left_values / 2)
+        step = np.abs(jd - right_jd)
+        right_jd, right_values = jd, values
+        if step.max() < EVENT_EPSILON_DAYS:
+            break
+    return right_jd
+
+def find_moon_ingresses(grid_jd, longitudes, galactic_longitudes, eph, timescale):
+    """
+    Find the times the Moon crosses into a new sign under both alignments, the
+    tropical (Western Occult) longitudes and the Galactic Center corrected ones,
+    refining every crossing of both in one batched pass.
+    Returns (Time array, index of each sign entered, event types).
+    """
+    import numpy as np
+
+    left, right, entered, galactic = [], [], [], []
+    for galacticCenter_on, grid_longitudes in ((True, galactic_longitudes), (False, longitudes)):
+        signs = calculate_zodiac_indices(grid_longitudes)
+        changes = np.flatnonzero(signs[1:] != signs[:-1])
+        left.append(changes)
+        right.append(changes + 1)
+        entered.append(signs[changes + 1])
+        galactic.append(np.full(len(changes), galacticCenter_on))
+    left, right, entered, galactic = (np.concatenate(parts) for parts in (left, right, entered, galactic))
+    boundaries = entered * 30.0
+
+    def distance_past_boundary(values):
+        # Signed distance past the boundary, wrapped to [-180, 180) so Pisces -> Aries works
+        return (values - boundaries + 180.0) % 360.0 - 180.0
+
+    def past_boundary(times):
+        raw, corrected = moon_longitudes(eph, times, True)
+        return distance_past_boundary(np.where(galactic, corrected, raw))
+
+    left_values = distance_past_boundary(np.where(galactic, galactic_longitudes[left], longitudes[left]))
+    right_values = distance_past_boundary(np.where(galactic, galactic_longitudes[right], longitudes[right]))
+    times = timescale.tt_jd(refine_roots(timescale, grid_jd[left], grid_jd[right], left_values, right_values, past_boundary))
+    return times, entered, np.where(galactic, MOON_INGRESS_EVENTS[True], MOON_INGRESS_EVENTS[False])
+
+def build_ingress_events(times, signs, kinds, eph):
+    """
+    Build ingress (or void-of-course) event dictionaries. The corrected longitude
+    of each event is the longitude in the event's own alignment, so its sign is
+    the one entered (or left); a value that lands a hair short of the sign
+    boundary is moved onto it.
+    """
+    import numpy as np
+
+    if len(times) == 0:
+        return []
+    try:
+        longitudes, galactic_longitudes = moon_longitudes(eph, times, True)
+        galactic = np.isin(kinds, (MOON_INGRESS_EVENTS[True], MOON_VOID_OF_COURSE_EVENTS[True]))
+        corrected_longitudes = np.where(galactic, galactic_longitudes, longitudes)
+        corrected_longitudes = np.where(calculate_zodiac_indices(corrected_longitudes) == signs, corrected_longitudes, signs * 30.0)
+    except Exception as e:
+        logging.error(f"Error calculating Moon positions: {e}", exc_info=True)
+        return []
+
+    count_event("events_calculated", len(times))
+    return make_phase_events(kinds, times.utc_datetime(), longitudes, corrected_longitudes)
+
+def interpolate_grid(grid_jd, grid_values, rows, jd):
+    """
+    Interpolate smooth grid values at the given TT Julian dates with a cubic
+    through the four grid points around each date. grid_values holds one series
+    per row and rows picks the series for each date.
+    """
+    import numpy as np
+
+    nodes = np.clip(np.searchsorted(grid_jd, jd) - 2, 0, len(grid_jd) - 4)[:, None] + np.arange(4)
+    node_jd, node_values = grid_jd[nodes], grid_values[rows[:, None], nodes]
+    result = np.zeros(len(jd))
+    for k in range(4):
+        weight = np.ones(len(jd))
+        for j in range(4):
+            if j != k:
+                weight *= (jd - node_jd[:, j]) / (node_jd[:, k] - node_jd[:, j])
+        result += weight * node_values[:, k]
+    return result
+
+def find_moon_aspects(grid_jd, grid_times, longitudes, eph, timescale):
+    """
+    Find the times the Moon makes an exact major aspect (see MAJOR_ASPECTS) to
+    one of the ASPECT_BODIES. The Moon outruns every planet, so its separation
+    from a body only grows, by less than ASPECT_STEP_DEGREES per grid step.
+    All crossings are refined in one batched pass that recomputes only the
+    Moon; the slow-moving bodies are interpolated from the grid, which is good
+    to about a second. Returns the sorted TT Julian dates.
+    """
+    import numpy as np
+
+    aspect_separations = [angle for angle in range(0, 360, ASPECT_STEP_DEGREES) if min(angle, 360 - angle) in MAJOR_ASPECTS]
+
+    def past_aspect(separations, crossed):
+        return (separations - crossed + 180.0) % 360.0 - 180.0
+
+    observer = eph["earth"].at(grid_times)
+    body_longitudes, bodies, left, crossed, left_values, right_values = [], [], [], [], [], []
+    for body, name in enumerate(ASPECT_BODIES):
+        grid_longitudes = observer.observe(eph[name]).apparent().ecliptic_latlon()[1].degrees
+        separations = (longitudes - grid_longitudes) % 360.0
+        steps = (separations // ASPECT_STEP_DEGREES).astype(int)
+        changes = np.flatnonzero(steps[1:] != steps[:-1])
+        # The separation crossed is the lower edge of the step it moved into
+        angles = steps[changes + 1] * ASPECT_STEP_DEGREES
+        aspects = np.isin(angles, aspect_separations)
+        changes, angles = changes[aspects], angles[aspects]
+        body_longitudes.append(np.degrees(np.unwrap(np.radians(grid_longitudes))))
+        bodies.append(np.full(len(changes), body))
+        left.append(changes)
+        crossed.append(angles)
+        left_values.append(past_aspect(separations[changes], angles))
+        right_values.append(past_aspect(separations[changes + 1], angles))
+    body_longitudes = np.array(body_longitudes)
+    bodies, left, crossed, left_values, right_values = (np.concatenate(parts) for parts in (bodies, left, crossed, left_values, right_values))
+
+    def moon_past_aspect(times):
+        separations = moon_longitudes(eph, times, False)[0] - interpolate_grid(grid_jd, body_longitudes, bodies, times.tt)
+        return past_aspect(separations % 360.0, crossed)
+
+    return np.sort(refine_roots(timescale, grid_jd[left], grid_jd[left + 1], left_values, right_values, moon_past_aspect))
+
+def find_void_of_course(ingress_times, signs, kinds, aspect_jd, timescale):
+    """
+    Find when the Moon goes void of course before each ingress: at its last
+    major aspect since the previous ingress of the same alignment, or at that
+    ingress when it made none in the sign. Ingresses without a previous one
+    are skipped. Returns (Time array, index of the sign being left, event types).
+    """
+    import numpy as np
+
+    ingress_jd = ingress_times.tt
+    starts, leaving, void_kinds = [], [], []
+    for galacticCenter_on in (True, False):
+        own = np.flatnonzero(kinds == MOON_INGRESS_EVENTS[galacticCenter_on])
+        own = own[np.argsort(ingress_jd[own])]
+        previous_jd, next_jd = ingress_jd[own[:-1]], ingress_jd[own[1:]]
+        # The last aspect at or before each ingress, or -inf when there is none
+        last_jd = np.concatenate(([-np.inf], aspect_jd))[np.searchsorted(aspect_jd, next_jd, side="right")]
+        starts.append(np.where(last_jd > previous_jd, last_jd, previous_jd))
+        leaving.append(signs[own[:-1]])
+        void_kinds.append(np.full(len(previous_jd), MOON_VOID_OF_COURSE_EVENTS[galacticCenter_on]))
+    return timescale.tt_jd(np.concatenate(starts)), np.concatenate(leaving), np.concatenate(void_kinds)
+
+def find_lunar_apsides(grid_jd, grid_times, eph, timescale):
+    """
+    Find the Moon's perigees and apogees, where its radial velocity relative
+    to the Earth changes sign. Returns (Time array, event types).
+    """
+    import numpy as np
+
+    earth, moon = eph["earth"], eph["moon"]
+
+    def radial_velocity(times):
+        position = (moon - earth).at(times)
+        return np.einsum('ij,ij->j', position.position.km, position.velocity.km_per_s)
+
+    values = radial_velocity(grid_times)
+    changes = np.flatnonzero(np.sign(values[1:]) != np.sign(values[:-1]))
+    times = timescale.tt_jd(refine_roots(timescale, grid_jd[changes], grid_jd[changes + 1],
+                                         values[changes], values[changes + 1], radial_velocity))
+    # Approaching then receding is a perigee; receding then approaching an apogee
+    return times, np.where(values[changes] < 0, LUNAR_PERIGEE, LUNAR_APOGEE)
+
+def find_lunar_eclipses(start_time, end_time, eph):
     """
-    Calculate exact lunar phases for a given year using Skyfield.
+    Find lunar eclipses with Skyfield. Returns (Time array of greatest eclipse, event types).
     """
+    import numpy as np
+    from skyfield import eclipselib
+
+    times, kinds, _ = eclipselib.lunar_eclipses(start_time, end_time, eph)
+    return times, np.array([LUNAR_ECLIPSE_EVENTS[eclipselib.LUNAR_ECLIPSES[kind]] for kind in kinds], dtype=int)
+
+def find_solar_eclipses(new_moon_times, eph):
+    """
+    Pick out the New Moons that bring a solar eclipse somewhere on Earth.
+    A New Moon is eclipsing when the closest geocentric approach of the Sun and
+    Moon is within the sum of their apparent radii plus the lunar parallax;
+    it is central (total or annular) when the shadow axis meets the Earth.
+    Returns (Time array of the New Moons, event types).
+    """
+    import numpy as np
+
+    earth = eph["earth"].at(new_moon_times)
+    sun = earth.observe(eph["sun"]).apparent()
+    moon = earth.observe(eph["moon"]).apparent()
+    closest = sun.separation_from(moon).radians * ECLIPSE_CLOSEST_APPROACH_FACTOR
+    moon_km, sun_km = moon.distance().km, sun.distance().km
+    parallax = np.arcsin(EARTH_RADIUS_KM / moon_km) - np.arcsin(EARTH_RADIUS_KM / sun_km)
+    moon_radius, sun_radius = np.arcsin(MOON_RADIUS_KM / moon_km), np.arcsin(SUN_RADIUS_KM / sun_km)
+
+    eclipsing = closest < parallax + moon_radius + sun_radius
+    kinds = np.where(closest >= parallax, SOLAR_ECLIPSE_EVENTS["Partial"],
+                     np.where(moon_radius > sun_radius, SOLAR_ECLIPSE_EVENTS["Total"], SOLAR_ECLIPSE_EVENTS["Annular"]))
+    return new_moon_times[eclipsing], kinds[eclipsing]
+
+def build_extra_events(start_time, end_time, phase_times, phases, eph, timescale, galacticCenter_on=True, extra_events=()):
+    """
+    Calculate the requested extended events (see EXTRA_EVENT_CHOICES) between
+    two times. Ingresses, void-of-course starts and apsides share one batched
+    Moon position pass over a common time grid; solar eclipses are judged at the
+    New Moons already found by the phase search. Returns event dictionaries sorted by time.
+    """
+    import numpy as np
+
+    events = []
+    void_of_course = "void_of_course" in extra_events
+    if "ingress" in extra_events or "apsides" in extra_events or void_of_course:
+        grid_start, grid_end = start_time, end_time
+        if void_of_course:
+            # A void-of-course period can straddle either end, so its ingresses and aspects are searched past them
+            grid_start = timescale.tt_jd(start_time.tt - VOID_OF_COURSE_PADDING_DAYS)
+            grid_end = timescale.tt_jd(end_time.tt + VOID_OF_COURSE_PADDING_DAYS)
+        grid_jd = search_grid(grid_start, grid_end)
+        grid_times = timescale.tt_jd(grid_jd)
+
+    def within(times, *columns):
+        # Keep the events found on a padded grid that fall between start_time and end_time
+        keep = (times.tt >= start_time.tt) & (times.tt < end_time.tt)
+        return (times[keep],) + tuple(column[keep] for column in columns)
+
+    if "ingress" in extra_events or void_of_course:
+        longitudes, galactic_longitudes = moon_longitudes(eph, grid_times, True)
+        times, signs, kinds = find_moon_ingresses(grid_jd, longitudes, galactic_longitudes, eph, timescale)
+        if "ingress" in extra_events:
+            events.extend(build_ingress_events(*within(times, signs, kinds), eph))
+        if void_of_course:
+            aspect_jd = find_moon_aspects(grid_jd, grid_times, longitudes, eph, timescale)
+            events.extend(build_ingress_events(*within(*find_void_of_course(times, signs, kinds, aspect_jd, timescale)), eph))
+    if "apsides" in extra_events:
+        times, kinds = within(*find_lunar_apsides(grid_jd, grid_times, eph, timescale))
+        events.extend(build_phase_events(times, kinds, eph, galacticCenter_on))
+    if "eclipses" in extra_events:
+        times, kinds = find_lunar_eclipses(start_time, end_time, eph)
+        events.extend(build_phase_events(times, kinds, eph, galacticCenter_on))
+        new_moons = phase_times[np.asarray(phases) == 0]
+        if len(new_moons):
+            times, kinds = find_solar_eclipses(new_moons, eph)
+            events.extend(build_phase_events(times, kinds, eph, galacticCenter_on))
+    return sorted(events, key=lambda event: event["datetime"])
+
+def calculate_lunar_phases(year, eph, timescale, galacticCenter_on=True, extra_events=()):
+    """
+    Calculate exact lunar phases for a given year using Skyfield, plus any
+    requested extended events (see EXTRA_EVENT_CHOICES).
+    """
+    from skyfield import almanac
+
     try:
         # Define the time range for the year
         start_time = timescale.utc(year, 1, 1)
@@ -134,172 +756,1142 @@ def calculate_lunar_phases(year, eph, timescale, galacticCenter_on=True):
 
         # Calculate lunar phases
         try:
-            times, phases = almanac.find_discrete(start_time, end_time, almanac.moon_phases(eph))
+            with stage_timer("phase_search", year):
+                times, phases = almanac.find_discrete(start_time, end_time, almanac.moon_phases(eph))
             if len(times) == 0:
                 logging.warning(f"No lunar phases found for year {year}. Check ephemeris data and time range.")
         except Exception as e:
             logging.error(f"Error during lunar phase calculation for year {year}: {e}", exc_info=True)
             raise RuntimeError("Lunar phase calculation failed.") from e
 
-        # Map phases to their names and emojis
-        events = []
-        earth = eph["earth"]
-        moon = eph["moon"] 
-        for t, phase in zip(times, phases):
-            phase_name = MOON_PHASES.get(phase, "Unknown Phase")
+        with stage_timer("positions", year):
+            events = build_phase_events(times, phases, eph, galacticCenter_on)
+        if extra_events:
+            with stage_timer("extra_events", year):
+                extras = build_extra_events(start_time, end_time, times, phases, eph, timescale, galacticCenter_on, extra_events)
+            events = sorted(events + extras, key=lambda event: event["datetime"])
+        return events
+    except Exception as e:
+        logging.error(f"Error calculating lunar phases for year {year}: {e}", exc_info=True)
+        return []
+
+def span_chunk(year, chunk_years=SPAN_CHUNK_YEARS):
+    """
+    Return the (first, last) years of the fixed chunk holding a year. Chunks start
+    at multiples of chunk_years, so a year is always searched in the same window
+    whatever range, stale years or worker count a run has.
+    """
+    first = year // chunk_years * chunk_years
+    return first, first + chunk_years - 1
 
-            # Calculate Moon's position
-            try:
-                astrometric = earth.at(t).observe(moon)
-                longitude = astrometric.apparent().ecliptic_latlon()[1].degrees
+def ephemeris_years(eph, timescale):
+    """
+    Return the first and last whole calendar years covered by every segment of the ephemeris.
+    """
+    start_jd = max(segment.start_jd for segment in eph.spk.segments)
+    end_jd = min(segment.end_jd for segment in eph.spk.segments)
+    return timescale.tt_jd(start_jd).utc.year + 1, timescale.tt_jd(end_jd).utc.year - 1
 
-                if galacticCenter_on:
-                    # Calculate fractional year for Galactic Center
-                    fractional_year_value = t.utc_datetime().year + (t.utc_datetime().timetuple().tm_yday / 365.25)
-                    galacticCenter = calculate_ayanamsa(fractional_year_value)
+def calculate_lunar_phases_span(start_year, end_year, eph, timescale, galacticCenter_on=True, chunk_years=SPAN_CHUNK_YEARS,
+                                extra_events=()):
+    """
+    Calculate lunar phases (and any requested extended events) for a whole year
+    range with one search per fixed chunk of years (see span_chunk), then split
+    the events into per-year buckets, dropping the chunks' years outside the range.
+    Chunks are cut short only where they run past the ephemeris.
+    """
+    from skyfield import almanac
 
-                    # Adjust longitude with Galactic Center
-                    corrected_longitude = adjust_position(longitude, galacticCenter)
-                else:
-                    corrected_longitude = longitude
+    first_covered, last_covered = ephemeris_years(eph, timescale)
+    phases_by_year = {year: [] for year in range(start_year, end_year + 1)}
+    for chunk_start in range(span_chunk(start_year, chunk_years)[0], end_year + 1, chunk_years):
+        chunk_end = chunk_start + chunk_years - 1
+        # Clamp to the ephemeris, but never past the requested years, which then fail as before
+        chunk_start = min(max(chunk_start, first_covered), max(chunk_start, start_year))
+        chunk_end = max(min(chunk_end, last_covered), min(chunk_end, end_year))
+        try:
+            start_time = timescale.utc(chunk_start, 1, 1)
+            end_time = timescale.utc(chunk_end + 1, 1, 1)
 
-            except NameError as e:
-                logging.error(f"NameError: {e} - Ensure ephemeris objects are initialized correctly.")
-                continue
-            except UnboundLocalError as e:
-                logging.error(f"UnboundLocalError: {e} - Issue with variable assignment.")
-                continue
             try:
-                longitude = astrometric.apparent().ecliptic_latlon()[1].degrees
-                zodiac_name, zodiac_emoji, zodiac_description = calculate_zodiac(corrected_longitude)
+                with stage_timer("phase_search"):
+                    times, phases = almanac.find_discrete(start_time, end_time, almanac.moon_phases(eph))
+                if len(times) == 0:
+                    logging.warning(f"No lunar phases found for years {chunk_start}-{chunk_end}. Check ephemeris data and time range.")
             except Exception as e:
-                logging.error(f"Error in zodiac calculation for longitude {longitude}: {e}", exc_info=True)
-                zodiac_name, zodiac_emoji, zodiac_description = "Unknown", "❓", "Unknown significance."
+                logging.error(f"Error during lunar phase calculation for years {chunk_start}-{chunk_end}: {e}", exc_info=True)
+                raise RuntimeError("Lunar phase calculation failed.") from e
 
-            events.append({
-                "datetime": t.utc_datetime(),
-                "phase": phase_name,
-                "zodiac_name": zodiac_name,
-                "zodiac_emoji": zodiac_emoji,
-                "zodiac_description": zodiac_description
-            })
+            with stage_timer("positions"):
+                events = build_phase_events(times, phases, eph, galacticCenter_on)
+            if extra_events:
+                with stage_timer("extra_events"):
+                    extras = build_extra_events(start_time, end_time, times, phases, eph, timescale, galacticCenter_on, extra_events)
+                events = sorted(events + extras, key=lambda event: event["datetime"])
+            for event in events:
+                if event["datetime"].year in phases_by_year:
+                    phases_by_year[event["datetime"].year].append(event)
+        except Exception as e:
+            logging.error(f"Error calculating lunar phases for years {chunk_start}-{chunk_end}: {e}", exc_info=True)
 
-        return events
-    except Exception as e:
-        logging.error(f"Error calculating lunar phases for year {year}: {e}", exc_info=True)
+    return phases_by_year
+
+def file_sha256(path):
+    """
+    Return the SHA-256 hex digest of a file.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def ephemeris_hash(ephemeris_file=EPHEMERIS_FILE, memo_file=EPHEMERIS_HASH_FILE):
+    """
+    Return the SHA-256 hex digest of the ephemeris file. The digest is remembered
+    in memo_file with the file's size and modification time, so an unchanged
+    ephemeris is not read again on the next run.
+    """
+    stat = os.stat(ephemeris_file)
+    signature = {"path": os.path.abspath(ephemeris_file), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    try:
+        with open(memo_file, 'r') as f:
+            memo = json.load(f)
+        if memo.get("signature") == signature:
+            return memo["sha256"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    digest = file_sha256(ephemeris_file)
+    try:
+        temp_file = f"{memo_file}.{os.getpid()}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump({"signature": signature, "sha256": digest}, f)
+        os.replace(temp_file, memo_file)
+    except OSError as e:
+        logging.warning(f"Could not remember the ephemeris hash in {memo_file}: {e}")
+    return digest
+
+def excerpt_block(start_year, end_year):
+    """
+    Widen a year range to whole EXCERPT_BLOCK_YEARS blocks, e.g. 2024-2026 to 2020-2029.
+    """
+    return (start_year // EXCERPT_BLOCK_YEARS * EXCERPT_BLOCK_YEARS,
+            end_year // EXCERPT_BLOCK_YEARS * EXCERPT_BLOCK_YEARS + EXCERPT_BLOCK_YEARS - 1)
+
+def find_excerpt(start_year, end_year, base_name, eph_hash):
+    """
+    Return the smallest existing excerpt of the ephemeris that covers the given years, or None.
+    """
+    best = None
+    try:
+        names = os.listdir(EPHEMERIS_EXCERPT_DIR)
+    except FileNotFoundError:
+        return None
+    suffix = f"_{eph_hash[:12]}_v{EXCERPT_VERSION}.bsp"
+    for name in names:
+        if not (name.startswith(base_name + "_") and name.endswith(suffix)):
+            continue
+        try:
+            first, last = (int(part) for part in name[len(base_name) + 1:-len(suffix)].split("_"))
+        except ValueError:
+            continue
+        if first <= start_year and end_year <= last and (best is None or last - first < best[1] - best[0]):
+            best = (first, last, name)
+    return os.path.join(EPHEMERIS_EXCERPT_DIR, best[2]) if best else None
+
+def evict_excerpts(keep_file, max_files=EXCERPT_MAX_FILES):
+    """
+    Delete the least recently used excerpts (by modification time, which reuse
+    refreshes) beyond max_files, never deleting keep_file.
+    """
+    files = [os.path.join(EPHEMERIS_EXCERPT_DIR, name) for name in os.listdir(EPHEMERIS_EXCERPT_DIR) if name.endswith(".bsp")]
+    if len(files) <= max_files:
+        return
+    files.sort(key=lambda path: os.stat(path).st_mtime_ns, reverse=True)
+    for path in files[max_files:]:
+        if path != keep_file:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logging.warning(f"Could not evict ephemeris excerpt {path}: {e}")
+
+def ephemeris_excerpt(start_year, end_year, eph_hash, ephemeris_file=EPHEMERIS_FILE, max_files=EXCERPT_MAX_FILES):
+    """
+    Return the path of a small SPK file with only the EXCERPT_TARGETS
+    segments covering the given years. Any existing excerpt that covers the
+    years is reused; otherwise the surrounding EXCERPT_BLOCK_YEARS blocks are
+    cut from the full ephemeris and the least recently used excerpts beyond
+    max_files are evicted. The coefficients are copied unchanged, so results are identical.
+    """
+    base_name = os.path.splitext(os.path.basename(ephemeris_file))[0]
+    excerpt_file = find_excerpt(start_year, end_year, base_name, eph_hash)
+    if excerpt_file is not None:
+        try:
+            os.utime(excerpt_file)  # Mark as recently used for eviction
+            return excerpt_file
+        except FileNotFoundError:
+            pass  # Evicted by another run in the meantime
+
+    from jplephem.calendar import compute_julian_date
+    from jplephem.excerpter import write_excerpt
+    from jplephem.spk import SPK, T0, S_PER_DAY
+
+    block_start, block_end = excerpt_block(start_year, end_year)
+    excerpt_file = os.path.join(EPHEMERIS_EXCERPT_DIR, f"{base_name}_{block_start}_{block_end}_{eph_hash[:12]}_v{EXCERPT_VERSION}.bsp")
+    os.makedirs(EPHEMERIS_EXCERPT_DIR, exist_ok=True)
+    spk = SPK.open(ephemeris_file)
+    try:
+        summaries = [(name, values) for name, values in spk.daf.summaries() if values[2] in EXCERPT_TARGETS]
+        # Blocks can reach past the ephemeris; claim no more coverage than the full file has
+        covered_start = max(min(values[0] for _, values in summaries if values[2] == target) for target in EXCERPT_TARGETS)
+        covered_end = min(max(values[1] for _, values in summaries if values[2] == target) for target in EXCERPT_TARGETS)
+        start_jd = max(compute_julian_date(block_start, 1, 1) - EXCERPT_PADDING_DAYS, T0 + covered_start / S_PER_DAY)
+        end_jd = min(compute_julian_date(block_end + 1, 1, 1) + EXCERPT_PADDING_DAYS, T0 + covered_end / S_PER_DAY)
+        temp_file = f"{excerpt_file}.{os.getpid()}.tmp"
+        with open(temp_file, 'w+b') as f:
+            write_excerpt(spk, f, start_jd, end_jd, summaries)
+        os.replace(temp_file, excerpt_file)
+    finally:
+        spk.close()
+    print(f"Ephemeris excerpt created: {excerpt_file}")
+    evict_excerpts(excerpt_file, max_files)
+    return excerpt_file
+
+def search_window(year, engine="span", chunk_years=SPAN_CHUNK_YEARS):
+    """
+    Return the (first, last) years of the search that calculates a year: its
+    fixed chunk for the span engine, or the year alone for the yearly engine.
+    """
+    return span_chunk(year, chunk_years) if engine == "span" else (year, year)
+
+def phase_cache_key(year, eph_hash, galacticCenter_on=True, extra_events=(), window=None):
+    """
+    Build the cache key for one year of phase events. Any change to the
+    ephemeris file, the ayanamsa constants, the search window (see search_window)
+    or the extended event types produces a different key.
+    """
+    alignment = "galactic_center" if galacticCenter_on else "tropical"
+    first, last = window or (year, year)
+    key = f"{year}|{eph_hash}|{alignment}|{REFERENCE_POSITION}|{PRECESSION_RATE}|{REFERENCE_YEAR}|{first}-{last}"
+    return f"{key}|{','.join(extra_events)}|{EXTRA_EVENT_VERSION}" if extra_events else key
+
+def open_phase_cache(cache_file=CACHE_FILE):
+    """
+    Open (and create if needed) the SQLite phase-event cache.
+    """
+    connection = sqlite3.connect(cache_file, timeout=60)
+    connection.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, last_used REAL NOT NULL)")
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS events (key TEXT NOT NULL, utc_us INTEGER NOT NULL, phase INTEGER NOT NULL, "
+        "longitude REAL NOT NULL, corrected_longitude REAL NOT NULL)"
+    )
+    connection.execute("CREATE INDEX IF NOT EXISTS events_key ON events (key)")
+    connection.commit()
+    return connection
+
+def phase_event_rows(events):
+    """
+    Reduce events to compact (UTC microseconds, phase index, longitude, corrected longitude) rows.
+    """
+    return [
+        ((event["datetime"] - UNIX_EPOCH) // timedelta(microseconds=1), event["phase_index"],
+         event["longitude"], event["corrected_longitude"])
+        for event in events
+    ]
+
+def phase_events_from_rows(rows):
+    """
+    Rebuild full event dictionaries from rows produced by phase_event_rows.
+    """
+    if not rows:
         return []
+    utc_us, phases, longitudes, corrected_longitudes = zip(*rows)
+    datetimes = [UNIX_EPOCH + timedelta(microseconds=value) for value in utc_us]
+    return make_phase_events(phases, datetimes, longitudes, corrected_longitudes)
 
-def create_ics_file(phases, year, timezone, galacticCenter_on=True):
+def load_cached_phases(connection, key):
     """
-    Create an ICS file from lunar phases and save it in the output directory.
+    Return the cached events for a key, or None if the key is not cached.
+    """
+    if connection.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is None:
+        return None
+    rows = connection.execute(
+        "SELECT utc_us, phase, longitude, corrected_longitude FROM events WHERE key = ? ORDER BY utc_us", (key,)
+    ).fetchall()
+    with connection:
+        connection.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+    return phase_events_from_rows(rows)
+
+def store_cached_phases(connection, key, events, max_entries=CACHE_MAX_ENTRIES):
+    """
+    Store the events for a key, evicting the least recently used entries beyond max_entries.
     """
+    rows = [(key,) + row for row in phase_event_rows(events)]
+    with connection:
+        connection.execute("DELETE FROM events WHERE key = ?", (key,))
+        connection.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?)", rows)
+        connection.execute("INSERT OR REPLACE INTO entries VALUES (?, ?)", (key, time.time()))
+        stale = connection.execute(
+            "SELECT key FROM entries ORDER BY last_used DESC LIMIT -1 OFFSET ?", (max_entries,)
+        ).fetchall()
+        if stale:
+            connection.executemany("DELETE FROM events WHERE key = ?", stale)
+            connection.executemany("DELETE FROM entries WHERE key = ?", stale)
+
+def resolve_timezone(timezone):
+    """
+    Resolve an IANA timezone name, or return None (after logging) if it is unknown.
+    """
+    import pytz
+
     try:
-        calendar = Calendar()
+        return pytz.timezone(timezone)
+    except pytz.UnknownTimeZoneError:
+        logging.error(f"Invalid timezone: {timezone}")
+        return None
 
+# Summary/description templates in use, keyed by event index; see set_description_templates
+_summary_templates = dict(EXTRA_EVENT_SUMMARY_TEMPLATES)
+_description_templates = {**PHASE_DESCRIPTION_TEMPLATES, **EXTRA_EVENT_DESCRIPTION_TEMPLATES}
+
+def load_description_templates(path):
+    """
+    Load user templates from a JSON file mapping event indices to
+    {"summary": ..., "description": ...} str.format templates.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    templates = {}
+    for key, value in data.items():
+        phase_index = int(key)
+        if phase_index not in EVENT_NAMES:
+            raise ValueError(f"Unknown event index in templates: {key}")
+        if not isinstance(value, dict) or not set(value) <= {"summary", "description"}:
+            raise ValueError(f"Templates for phase {key} must be an object with 'summary' and/or 'description'.")
+        for kind, template in value.items():
+            check_template(template, f"{kind} template for phase {key}")
+        templates[phase_index] = value
+    return templates
+
+def check_template(template, label):
+    """
+    Raise ValueError if a template is not a string or cannot be filled from TEMPLATE_FIELDS,
+    so a bad placeholder fails when templates load rather than when a calendar is rendered.
+    """
+    if not isinstance(template, str):
+        raise ValueError(f"The {label} must be a string.")
+    try:
+        template.format(**{field: "" for field in TEMPLATE_FIELDS})
+    except KeyError as e:
+        raise ValueError(f"Unknown field {{{e.args[0]}}} in the {label}. Available fields: {', '.join(TEMPLATE_FIELDS)}.") from e
+    except (IndexError, ValueError, AttributeError) as e:
+        raise ValueError(f"Invalid {label}: {e}. Use named fields such as {{phase_name}}; write literal braces as {{{{ and }}}}.") from e
+
+def set_description_templates(templates=None):
+    """
+    Install user templates on top of the defaults and clear the rendered-text memo.
+    """
+    _summary_templates.clear()
+    _summary_templates.update(EXTRA_EVENT_SUMMARY_TEMPLATES)
+    _description_templates.clear()
+    _description_templates.update(PHASE_DESCRIPTION_TEMPLATES)
+    _description_templates.update(EXTRA_EVENT_DESCRIPTION_TEMPLATES)
+    for phase_index, template in (templates or {}).items():
+        if "summary" in template:
+            _summary_templates[phase_index] = template["summary"]
+        if "description" in template:
+            _description_templates[phase_index] = template["description"]
+    render_event_text.cache_clear()
+
+@functools.lru_cache(maxsize=None)
+def render_event_text(phase_index, zodiac_index, month, alignment):
+    """
+    Render the summary and description for a (phase, sign, local month, alignment) combination.
+    There are only a few thousand of these, so results are memoized.
+    """
+    if zodiac_index < 0:
+        zodiac_name, zodiac_emoji, zodiac_description = "Unknown", "", "No description available."
+    else:
+        zodiac_name, zodiac_emoji, zodiac_description = ZODIAC_SIGNS[zodiac_index]
+
+    # Determine cultural moon name for Full Moon
+    cultural_name = ""
+    cultural_title = ""
+    cultural_significance = "No cultural significance available."
+    if phase_index == FULL_MOON_PHASE:
+        cultural_name = CULTURAL_MOON_NAMES.get(month, "")
+        cultural_title = f" ({CULTURAL_MOON_NAMES.get(month, 'Full Moon')})"
+        cultural_significance = CULTURAL_SIGNIFICANCES.get(cultural_name, cultural_significance)
+
+    fields = {
+        "phase_name": EVENT_NAMES.get(phase_index, "Unknown Phase"),
+        "cultural_name": cultural_name,
+        "cultural_title": cultural_title,
+        "cultural_significance": cultural_significance,
+        "month_name": datetime(2000, month, 1).strftime('%B'),
+        "zodiac_name": zodiac_name,
+        "zodiac_emoji": zodiac_emoji,
+        "zodiac_description": zodiac_description,
+        "alignment": alignment,
+    }
+    summary = _summary_templates.get(phase_index, DEFAULT_SUMMARY_TEMPLATE).format(**fields)
+    description = _description_templates.get(phase_index, DEFAULT_DESCRIPTION_TEMPLATE).format(**fields)
+    return summary, description
+
+def render_phase_event(phase, tzinfo, alignment):
+    """
+    Render the summary, localized start time and description of a phase event.
+    A tzinfo of None leaves the start time in UTC.
+    """
+    phase_datetime = phase["datetime"]
+    localized_datetime = phase_datetime.astimezone(tzinfo) if tzinfo is not None else phase_datetime
+    summary, description = render_event_text(phase["phase_index"], phase["zodiac_index"], localized_datetime.month, alignment)
+    return summary, localized_datetime, description
+
+def escape_ics_text(text):
+    """
+    Escape a TEXT property value as described in RFC 5545 section 3.3.11.
+    Line breaks (CRLF, CR or LF) become \\n, the only escape the RFC defines for them.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def fold_ics_line(line):
+    """
+    Fold a content line into CRLF-terminated chunks of at most 75 octets
+    (RFC 5545 section 3.1), never splitting a UTF-8 character.
+    """
+    encoded = line.encode('utf-8')
+    if len(encoded) <= ICS_LINE_OCTETS:
+        return line + "\r\n"
+    chunks = []
+    start = 0
+    limit = ICS_LINE_OCTETS
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Back off to the start of a UTF-8 character
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        chunks.append(encoded[start:end].decode('utf-8'))
+        start = end
+        limit = ICS_LINE_OCTETS - 1  # Continuation lines start with a space
+    return "\r\n ".join(chunks) + "\r\n"
+
+def event_uid(begin_utc, phase_index, alignment, timezone):
+    """
+    Build a deterministic UID for an event from its start time, phase, alignment and timezone.
+    """
+    uid = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{ICS_UID_NAMESPACE}/{begin_utc}/{phase_index}/{alignment}/{timezone}"))
+    return f"{uid}@{ICS_UID_DOMAIN}"
+
+def write_ics_stream(f, phases, timezone, alignment, year=None):
+    """
+    Write a VCALENDAR to an open file, one VEVENT at a time as phases arrive.
+    Returns the number of events written. Rendering and writing time are
+    recorded as the "render" and "file_write" stages.
+    """
+    began = time.perf_counter()
+    render_seconds = 0.0
+    tzinfo = resolve_timezone(timezone)
+    f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n" + fold_ics_line(f"PRODID:{ICS_PRODID}"))
+    count = 0
+    for phase in phases:
+        render_began = time.perf_counter()
+        name, localized_datetime, description = render_phase_event(phase, tzinfo, alignment)
+        begin_utc = localized_datetime.replace(microsecond=0).astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        render_seconds += time.perf_counter() - render_began
+        f.write(
+            "BEGIN:VEVENT\r\n"
+            + fold_ics_line("DESCRIPTION:" + escape_ics_text(description))
+            + f"DTSTART:{begin_utc}\r\n"
+            + fold_ics_line("SUMMARY:" + escape_ics_text(name))
+            + fold_ics_line("UID:" + event_uid(begin_utc, phase["phase_index"], alignment, timezone))
+            + "END:VEVENT\r\n"
+        )
+        count += 1
+    f.write("END:VCALENDAR")
+    record_stage("render", render_seconds, year)
+    record_stage("file_write", time.perf_counter() - began - render_seconds, year)
+    count_event("events_written", count)
+    return count
+
+def create_ics_file(phases, year, timezone, galacticCenter_on=True, writer="stream", output_dir=OUTPUT_DIR):
+    """
+    Create an ICS file from lunar phases and save it in the output directory.
+    The "stream" writer serializes events directly to the file; "calendar"
+    builds an ics.Calendar as earlier versions did.
+    """
+    try:
         alignment = "Galactic Center"
         if galacticCenter_on!=True:
             alignment = "Western Occult"
 
-
-        for phase in phases:
-            phase_datetime = phase["datetime"]
-            phase_name = phase["phase"]
-            zodiac_name = phase["zodiac_name"]
-            zodiac_emoji = phase["zodiac_emoji"]
-            zodiac_description = phase["zodiac_description"]
+        output_file = os.path.join(output_dir, f"lunar_phases_{year}.ics")
+        if writer == "stream":
             try:
-                localized_datetime = phase_datetime.astimezone(pytz.timezone(timezone))
-            except pytz.UnknownTimeZoneError:
-                logging.error(f"Invalid timezone: {timezone}")
-                localized_datetime = phase_datetime
-
-            # Determine cultural moon name for Full Moon
-            cultural_title = ""
-            if "Full Moon" in phase_name:
-                month = localized_datetime.month
-                cultural_title = CULTURAL_MOON_NAMES.get(month, "Full Moon")
-                if cultural_title:
-                    cultural_title = f" ({cultural_title})"
-
-            # Determine cultural moon name for Full Moon
-            cultural_name = ""
-            cultural_significance = CULTURAL_SIGNIFICANCES.get(cultural_name, "No cultural significance available.")
-            if "Full Moon" in phase_name:
-                month = localized_datetime.month
-                cultural_name = CULTURAL_MOON_NAMES.get(month, "")
-                if cultural_name:
-                    cultural_name = f"{cultural_name}"
-                    cultural_significance = CULTURAL_SIGNIFICANCES.get(cultural_name, "No cultural significance available.")
-
-            # Enhanced descriptions
-            if "Full Moon" in phase_name:
-                description = (
-                    "The Full Moon occurs when the Moon is fully illuminated by the Sun, marking the midpoint of the lunar cycle.\n\n"
-                    + "This Full Moon is traditionally called the '" + cultural_name + " Moon' for the month of "
-                    + localized_datetime.strftime('%B') + ". " + cultural_significance + "\n\n"
-                    + "Significance: A time of culmination, celebration, and achieving clarity.\n\n"
-                    + "Meaning: A time of heightened emotions, clarity, and reflection.\n\n"
-                    + "Zodiac: " + zodiac_name + " " + zodiac_emoji + "\n"
-                    + "Alignment: " + alignment + "\n\n"
-                    + "Description: " + zodiac_description
-                )
-            elif "New Moon" in phase_name:
-                description = (
-                    "The New Moon marks the beginning of the lunar cycle.\n\n"
-                    + "The Moon is positioned between the Earth and the Sun, making it invisible from Earth.\n\n"
-                    + "Significance: A time for setting intentions and new beginnings.\n\n"
-                    + "Meaning: Represents a fresh start, reflection, and inward focus.\n\n"
-                    + "Zodiac: " + zodiac_name + " " + zodiac_emoji + "\n"
-                    + "Alignment: " + alignment + "\n\n"
-                    + "Description: " + zodiac_description
-                )
-            elif "1st Quarter" in phase_name:
-                description = (
-                    "The First Quarter Moon occurs when half the Moon is illuminated, and the other half remains dark.\n\n"
-                    + "This phase is a time of action, decisions, and challenges as you work toward your goals.\n\n"
-                    + "Significance: Represents a period of growth and progress in many traditions.\n\n"
-                    + "Meaning: A time to confront obstacles and make important choices, paving the way for success.\n\n"
-                    + "Zodiac: " + zodiac_name + " " + zodiac_emoji + "\n"
-                    + "Alignment: " + alignment + "\n\n"
-                    + "Description: " + zodiac_description
-                )
-            elif "3rd Quarter" in phase_name:
-                description = (
-                    "The Third Quarter Moon occurs when half the Moon is illuminated as it wanes toward the New Moon.\n\n"
-                    + "This phase symbolizes release, reflection, and preparation for the next cycle.\n\n"
-                    + "Significance: Often associated with closure and letting go of what no longer serves you.\n\n"
-                    + "Meaning: A period of introspection, evaluation, and setting the stage for new beginnings.\n\n"
-                    + "Zodiac: " + zodiac_name + " " + zodiac_emoji + "\n"
-                    + "Alignment: " + alignment + "\n\n"
-                    + "Description: " + zodiac_description
-                )
-            else:
-                description = (
-                    "The " + phase_name + " occurs as part of the lunar cycle. "
-                    + "It represents a transition toward the next phase of the Moon."
-                )
-
-            # Create the event
-            event = Event()
-            event.name = phase_name + cultural_title + " " + zodiac_emoji
-            event.begin = localized_datetime.strftime('%Y-%m-%dT%H:%M:%S%z')
-            event.description = description
-            calendar.events.add(event)
+                with open(output_file, 'w', encoding='utf-8', newline='') as f:
+                    event_count = write_ics_stream(f, phases, timezone, alignment, year)
+                if not event_count:
+                    logging.warning(f"No events generated for year {year}.")
+                logging.info(f"Successfully created ICS file: {output_file}")
+            except Exception as e:
+                logging.error(f"Error writing ICS file for year {year}: {e}", exc_info=True)
+                raise RuntimeError(f"Failed to write ICS file for year {year}.") from e
+
+            print(f"ICS file created: {output_file}")
+            return output_file
+
+        from ics import Calendar, Event
+
+        calendar = Calendar()
+        tzinfo = resolve_timezone(timezone)
+        with stage_timer("render", year):
+            for phase in phases:
+                name, localized_datetime, description = render_phase_event(phase, tzinfo, alignment)
+
+                # Create the event
+                event = Event()
+                event.name = name
+                event.begin = localized_datetime.strftime('%Y-%m-%dT%H:%M:%S%z')
+                event.description = description
+                calendar.events.add(event)
 
         try:
-            output_file = os.path.join(OUTPUT_DIR, f"lunar_phases_{year}.ics")
             if not calendar.events:
                 logging.warning(f"No events generated for year {year}.")
-            with open(output_file, 'w') as f:
+            with stage_timer("file_write", year), open(output_file, 'w') as f:
                 f.writelines(calendar)
+            count_event("events_written", len(calendar.events))
             logging.info(f"Successfully created ICS file: {output_file}")
         except Exception as e:
             logging.error(f"Error writing ICS file for year {year}: {e}", exc_info=True)
             raise RuntimeError(f"Failed to write ICS file for year {year}.") from e
 
         print(f"ICS file created: {output_file}")
+        return output_file
     except Exception as e:
         logging.error(f"Error creating ICS file for year {year}: {e}", exc_info=True)
+        return None
+
+def create_event_store(phases_by_year, start_year, end_year, galacticCenter_on=True, eph_hash=None, store_dir=EVENT_STORE_DIR,
+                       extra_events=()):
+    """
+    Save phase events as a columnar store: one memory-mappable .npy array per
+    column in EVENT_STORE_COLUMNS, plus meta.json. The store is written to a
+    temporary directory and swapped into place, so readers never see a partial store.
+    """
+    import numpy as np
+
+    try:
+        events = [event for year in sorted(phases_by_year) for event in phases_by_year[year]]
+        columns = {
+            "utc_us": [(event["datetime"] - UNIX_EPOCH) // timedelta(microseconds=1) for event in events],
+            "phase": [event["phase_index"] for event in events],
+            "longitude": [event["longitude"] for event in events],
+            "corrected_longitude": [event["corrected_longitude"] for event in events],
+            "sign": [event["zodiac_index"] for event in events],
+        }
+        meta = {
+            "version": EVENT_STORE_VERSION,
+            "start_year": start_year,
+            "end_year": end_year,
+            "galactic_center": galacticCenter_on,
+            "alignment": "Galactic Center" if galacticCenter_on else "Western Occult",
+            "ephemeris_sha256": eph_hash,
+            "extra_events": list(extra_events),
+            "extra_event_version": EXTRA_EVENT_VERSION if extra_events else None,
+            "count": len(events),
+            "columns": EVENT_STORE_COLUMNS,
+        }
+
+        temp_dir = store_dir + ".tmp"
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        os.makedirs(temp_dir)
+        for name, dtype in EVENT_STORE_COLUMNS.items():
+            np.save(os.path.join(temp_dir, f"{name}.npy"), np.asarray(columns[name], dtype=dtype))
+        with open(os.path.join(temp_dir, "meta.json"), 'w') as f:
+            json.dump(meta, f, indent=2)
+        shutil.rmtree(store_dir, ignore_errors=True)
+        os.replace(temp_dir, store_dir)
+        logging.info(f"Successfully created event store: {store_dir}")
+        print(f"Event store created: {store_dir} ({len(events)} events)")
+        return store_dir
+    except Exception as e:
+        logging.error(f"Error creating event store {store_dir}: {e}", exc_info=True)
+        return None
+
+def open_event_store(store_dir=EVENT_STORE_DIR):
+    """
+    Open an event store without reading it: every column is memory-mapped
+    read-only. Returns {"meta": ..., "columns": {name: array}}.
+    """
+    import numpy as np
+
+    with open(os.path.join(store_dir, "meta.json"), 'r') as f:
+        meta = json.load(f)
+    if meta.get("version") != EVENT_STORE_VERSION:
+        raise ValueError(f"Unsupported event store version {meta.get('version')} in {store_dir}.")
+    columns = {name: np.load(os.path.join(store_dir, f"{name}.npy"), mmap_mode='r') for name in EVENT_STORE_COLUMNS}
+    return {"meta": meta, "columns": columns}
+
+def slice_event_store(store, start=None, end=None):
+    """
+    Return zero-copy views of the columns for events in [start, end), given as aware datetimes.
+    Only the pages touched by the binary search and the slice itself are read from disk.
+    """
+    import numpy as np
+
+    utc_us = store["columns"]["utc_us"]
+    first = 0 if start is None else int(np.searchsorted(utc_us, (start - UNIX_EPOCH) // timedelta(microseconds=1)))
+    last = len(utc_us) if end is None else int(np.searchsorted(utc_us, (end - UNIX_EPOCH) // timedelta(microseconds=1)))
+    return {name: column[first:last] for name, column in store["columns"].items()}
+
+def event_store_phases(columns):
+    """
+    Rebuild full event dictionaries, as used by create_ics_file, from event store columns.
+    """
+    return phase_events_from_rows(list(zip(columns["utc_us"].tolist(), columns["phase"].tolist(),
+                                           columns["longitude"].tolist(), columns["corrected_longitude"].tolist())))
+
+@functools.lru_cache(maxsize=None)
+def load_ephemeris(ephemeris_file=EPHEMERIS_FILE):
+    """
+    Load the ephemeris and timescale, once per process. The timescale uses
+    the leap-second and Delta T tables bundled with Skyfield, so no download is attempted.
+    """
+    with stage_timer("ephemeris_load"):
+        from skyfield.api import load_file, load
+
+        return load_file(ephemeris_file), load.timescale(builtin=True)
+
+def calculate_missing_phases(years, galacticCenter_on=True, engine="span", chunk_years=SPAN_CHUNK_YEARS, ephemeris_file=EPHEMERIS_FILE,
+                             extra_events=()):
+    """
+    Calculate phases for the given years. The span engine searches each run of
+    consecutive chunks holding a missing year in one pass; the yearly engine
+    searches year by year.
+    """
+    eph, timescale = load_ephemeris(ephemeris_file)
+    phases_by_year = {}
+    if engine != "span":
+        for year in years:
+            phases_by_year[year] = calculate_lunar_phases(year, eph, timescale, galacticCenter_on, extra_events)
+        return phases_by_year
+
+    # Years whose chunks are adjacent share one span call, so no chunk is searched twice
+    runs = []
+    for year in years:
+        if runs and span_chunk(year, chunk_years)[0] <= span_chunk(runs[-1][-1], chunk_years)[1] + 1:
+            runs[-1].append(year)
+        else:
+            runs.append([year])
+    for run_years in runs:
+        first, last = run_years[0], run_years[-1]
+        print(f"Calculating lunar phases for years {first}-{last}...")
+        calculated = calculate_lunar_phases_span(first, last, eph, timescale, galacticCenter_on, chunk_years, extra_events)
+        phases_by_year.update({year: calculated[year] for year in run_years})
+    return phases_by_year
+
+def collect_phases(years, galacticCenter_on=True, engine="span", chunk_years=SPAN_CHUNK_YEARS,
+                   eph_hash=None, cache_max_entries=CACHE_MAX_ENTRIES, ephemeris_file=EPHEMERIS_FILE, extra_events=()):
+    """
+    Return the phase events (and extended events) for a sorted list of years, keyed by year.
+    When eph_hash is given, years found in the phase-event cache skip the
+    ephemeris work entirely and newly calculated years are added to it.
+    """
+    phases_by_year = {}
+    cache = None
+    if eph_hash is not None:
+        try:
+            cache = open_phase_cache()
+            for year in years:
+                with stage_timer("cache_lookup", year):
+                    cached = load_cached_phases(cache, phase_cache_key(year, eph_hash, galacticCenter_on, extra_events,
+                                                                       search_window(year, engine, chunk_years)))
+                if cached is not None:
+                    phases_by_year[year] = cached
+                    count_event("events_cached", len(cached))
+        except sqlite3.Error as e:
+            logging.error(f"Phase-event cache unavailable, calculating all years: {e}", exc_info=True)
+            cache = None
+
+    missing_years = [year for year in years if year not in phases_by_year]
+    if missing_years:
+        calculated = calculate_missing_phases(missing_years, galacticCenter_on, engine, chunk_years, ephemeris_file, extra_events)
+        phases_by_year.update(calculated)
+        if cache is not None:
+            try:
+                for year in missing_years:
+                    if calculated[year]:
+                        key = phase_cache_key(year, eph_hash, galacticCenter_on, extra_events, search_window(year, engine, chunk_years))
+                        store_cached_phases(cache, key, calculated[year], cache_max_entries)
+            except sqlite3.Error as e:
+                logging.error(f"Failed to update the phase-event cache: {e}", exc_info=True)
+    if cache is not None:
+        cache.close()
+    return phases_by_year
+
+def timezone_output_dir(timezone, timezones):
+    """
+    Return the directory for a timezone's calendars: output/ for the default
+    single UTC run, otherwise output/<zone>/.
+    """
+    if timezones is None:
+        return OUTPUT_DIR
+    return os.path.join(OUTPUT_DIR, *timezone.split("/"))
+
+def calendar_label(year, timezone, timezones=None):
+    """
+    Return the name used for a calendar in progress and failure messages.
+    """
+    return str(year) if timezones is None else f"{year} ({timezone})"
+
+def render_years(phases_by_year, timezone, timezones=None, galacticCenter_on=True, writer="stream"):
+    """
+    Write one timezone's ICS files for the given per-year phases and return the labels of years that failed.
+    """
+    output_dir = timezone_output_dir(timezone, timezones)
+    os.makedirs(output_dir, exist_ok=True)
+    failed = []
+    for year, phases in sorted(phases_by_year.items()):
+        label = calendar_label(year, timezone, timezones)
+        print(f"Generating lunar phase calendar for year {label}...")
+        if not phases or create_ics_file(phases, year, timezone, galacticCenter_on, writer, output_dir) is None:
+            print(f"Failed to generate calendar for year {label}. Check {LOG_FILE} for details.")
+            failed.append(label)
+    return failed
+
+def all_calendars(start_year, end_year, timezones=None):
+    """
+    Return every (timezone -> years) calendar in a run, for use as the stale set of a full rebuild.
+    """
+    return {timezone: set(range(start_year, end_year + 1)) for timezone in (timezones or ["UTC"])}
+
+def manifest_inputs_digest(eph_hash, galacticCenter_on=True, engine="span", writer="stream", extra_events=(),
+                           chunk_years=SPAN_CHUNK_YEARS):
+    """
+    Hash every input shared by a run's calendars: ephemeris, alignment, engine
+    (and its chunk size), writer, extended event types, generator constants,
+    description tables and active templates. Extended event types and their
+    templates only count when extended events are requested, so they leave
+    the digest of a phases-only run unchanged.
+    """
+    event_names = EVENT_NAMES if extra_events else MOON_PHASES
+    inputs = {
+        "format": OUTPUT_FORMAT_VERSION,
+        "ephemeris": eph_hash,
+        "galactic_center": galacticCenter_on,
+        "engine": engine,
+        "writer": writer,
+        "constants": [REFERENCE_POSITION, PRECESSION_RATE, REFERENCE_YEAR],
+        "tables": [MOON_PHASES, CULTURAL_MOON_NAMES, CULTURAL_SIGNIFICANCES, ZODIAC_SIGNS],
+        "templates": [DEFAULT_SUMMARY_TEMPLATE, DEFAULT_DESCRIPTION_TEMPLATE,
+                      {index: template for index, template in _summary_templates.items() if index in event_names},
+                      {index: template for index, template in _description_templates.items() if index in event_names}],
+    }
+    if extra_events:
+        inputs["extra_events"] = list(extra_events)
+        inputs["extra_event_names"] = EXTRA_EVENTS
+        inputs["extra_event_version"] = EXTRA_EVENT_VERSION
+    if engine == "span":
+        # chunk_years sets the fixed search windows (see span_chunk), and a different
+        # window samples the moon on a different grid, which can move an event by a second
+        inputs["chunk_years"] = chunk_years
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+
+def calendar_inputs_hash(inputs_digest, year, timezone):
+    """
+    Hash the inputs of a single calendar file.
+    """
+    return hashlib.sha256(f"{inputs_digest}|{year}|{timezone}".encode('utf-8')).hexdigest()
+
+def calendar_manifest_path(year, timezone, timezones=None):
+    """
+    Return a calendar's path relative to the output directory, as used for manifest keys.
+    """
+    path = os.path.join(timezone_output_dir(timezone, timezones), f"lunar_phases_{year}.ics")
+    return os.path.relpath(path, OUTPUT_DIR).replace(os.sep, "/")
+
+def load_manifest(manifest_file=MANIFEST_FILE):
+    """
+    Load the output manifest, or return an empty one if it is missing or unreadable.
+    """
+    try:
+        with open(manifest_file, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logging.error(f"Ignoring unreadable manifest {manifest_file}: {e}")
+    return {"version": MANIFEST_VERSION, "calendars": {}}
+
+def save_manifest(manifest, manifest_file=MANIFEST_FILE):
+    """
+    Write the output manifest atomically.
+    """
+    temp_file = manifest_file + ".tmp"
+    with open(temp_file, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_file, manifest_file)
+
+def stale_calendars(manifest, start_year, end_year, timezones, inputs_digest):
+    """
+    Return the (timezone -> years) calendars whose file is missing, was
+    changed since it was written, or was built from different inputs.
+    """
+    stale = {}
+    for timezone, years in all_calendars(start_year, end_year, timezones).items():
+        stale[timezone] = set()
+        for year in years:
+            entry = manifest["calendars"].get(calendar_manifest_path(year, timezone, timezones))
+            path = os.path.join(OUTPUT_DIR, calendar_manifest_path(year, timezone, timezones))
+            if (entry is None or entry.get("inputs") != calendar_inputs_hash(inputs_digest, year, timezone)
+                    or not os.path.exists(path) or file_sha256(path) != entry.get("sha256")):
+                stale[timezone].add(year)
+    return stale
+
+def record_calendars(manifest, stale, failed, timezones, inputs_digest):
+    """
+    Record the inputs and content hash of every calendar that was just written.
+    """
+    failed = set(failed)
+    for timezone, years in stale.items():
+        for year in years:
+            if calendar_label(year, timezone, timezones) in failed:
+                continue
+            relative_path = calendar_manifest_path(year, timezone, timezones)
+            manifest["calendars"][relative_path] = {
+                "inputs": calendar_inputs_hash(inputs_digest, year, timezone),
+                "sha256": file_sha256(os.path.join(OUTPUT_DIR, relative_path)),
+            }
+
+def generate_years(start_year, end_year, galacticCenter_on=True, engine="span", chunk_years=SPAN_CHUNK_YEARS,
+                   eph_hash=None, cache_max_entries=CACHE_MAX_ENTRIES, writer="stream", timezones=None, stale=None,
+                   ephemeris_file=EPHEMERIS_FILE, extra_events=(), phases_out=None):
+    """
+    Generate the ICS files for a range of years and return the years that failed.
+    Phases are calculated once and rendered for every timezone in timezones
+    (default: UTC only, written straight to the output directory). When
+    stale maps timezones to sets of years, only those calendars are built.
+    When phases_out is a dict, the phases of every year in the range, including
+    years whose calendars are current, are collected in the same pass and stored in it.
+    """
+    if stale is None:
+        stale = all_calendars(start_year, end_year, timezones)
+    needed = set().union(*stale.values())
+    if phases_out is not None:
+        needed.update(range(start_year, end_year + 1))
+    if not needed:
+        return []
+    phases_by_year = collect_phases(sorted(needed), galacticCenter_on, engine, chunk_years, eph_hash, cache_max_entries, ephemeris_file,
+                                    extra_events)
+    if phases_out is not None:
+        phases_out.update(phases_by_year)
+    failed = []
+    for timezone in (timezones or ["UTC"]):
+        zone_phases = {year: phases_by_year[year] for year in sorted(stale.get(timezone, ()))}
+        if zone_phases:
+            failed.extend(render_years(zone_phases, timezone, timezones, galacticCenter_on, writer))
+    return failed
+
+# Per-process log records for parallel generation, collected by _init_worker's handler
+_worker_errors = []
+
+class _ErrorCollector(logging.Handler):
+    """
+    Logging handler that keeps (level, message) records so workers can hand them back to the parent.
+    """
+    def emit(self, record):
+        _worker_errors.append((record.levelno, self.format(record)))
+
+def _init_worker(templates=None, log_level=logging.ERROR):
+    """
+    Route a worker process's logging to the parent and install the run's
+    description templates. The ephemeris and timescale are loaded once per
+    worker by load_ephemeris on first use.
+    """
+    set_description_templates(templates)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(log_level)
+    collector = _ErrorCollector(level=log_level)
+    collector.setFormatter(logging.Formatter('%(message)s'))
+    root.addHandler(collector)
+
+def _run_worker_task(function, *args):
+    """
+    Worker entry point: run a task function and return its result with its
+    console output, log records and run stats.
+    """
+    del _worker_errors[:]
+    reset_run_stats()
+    output = io.StringIO()
+    result = None
+    try:
+        with contextlib.redirect_stdout(output):
+            result = function(*args)
+    except Exception as e:
+        logging.error(f"Worker task {function.__name__} failed: {e}", exc_info=True)
+    return {"output": output.getvalue(), "errors": list(_worker_errors), "stats": run_stats_snapshot(), "result": result}
+
+def _collect_phase_rows(years, galacticCenter_on, engine, chunk_years, eph_hash, cache_max_entries, ephemeris_file, extra_events):
+    """
+    Worker task: collect phases for a list of years as compact rows for cheap transfer to the parent.
+    """
+    phases_by_year = collect_phases(years, galacticCenter_on, engine, chunk_years, eph_hash, cache_max_entries, ephemeris_file, extra_events)
+    return {year: phase_event_rows(phases) for year, phases in phases_by_year.items()}
+
+def _render_phase_rows(rows_by_year, timezone, timezones, galacticCenter_on, writer):
+    """
+    Worker task: render one timezone's calendars for a group of years from compact rows.
+    """
+    phases_by_year = {year: phase_events_from_rows(rows) for year, rows in rows_by_year.items()}
+    return render_years(phases_by_year, timezone, timezones, galacticCenter_on, writer)
+
+def _report_worker_results(tasks, futures):
+    """
+    Print worker output, log worker records and merge worker stats in task
+    order, returning the task results (None on failure).
+    """
+    results = []
+    for label, future in zip(tasks, futures):
+        try:
+            outcome = future.result()
+        except Exception as e:
+            logging.error(f"Worker crashed for {label}: {e}", exc_info=True)
+            print(f"Worker failed for {label}. Check {LOG_FILE} for details.")
+            results.append(None)
+            continue
+        print(outcome["output"], end="")
+        for level, message in outcome["errors"]:
+            logging.log(level, f"[worker {label}] {message}")
+        merge_run_stats(outcome["stats"])
+        results.append(outcome["result"])
+    return results
+
+def generate_years_parallel(start_year, end_year, workers, galacticCenter_on=True, engine="span", chunk_years=SPAN_CHUNK_YEARS,
+                            eph_hash=None, cache_max_entries=CACHE_MAX_ENTRIES, writer="stream", timezones=None, templates=None,
+                            log_level=logging.ERROR, stale=None, ephemeris_file=EPHEMERIS_FILE, extra_events=(), phases_out=None):
+    """
+    Spread a year range across a process pool and return the years that failed.
+    Phases are collected first, one task per fixed span chunk (see span_chunk),
+    so the phase searches (and therefore the output) are the same as a serial
+    run whatever the worker count. Rendering then runs as one task per timezone and chunk.
+    Worker output and errors are reported by the parent in task order.
+    When stale maps timezones to sets of years, only those calendars are built.
+    When phases_out is a dict, the phases of every year in the range are
+    collected by the same tasks and stored in it (years of failed tasks are left out).
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if stale is None:
+        stale = all_calendars(start_year, end_year, timezones)
+    needed = set().union(*stale.values())
+    if phases_out is not None:
+        needed.update(range(start_year, end_year + 1))
+    if not needed:
+        return []
+    ranges = sorted({span_chunk(year, chunk_years) for year in needed})
+    range_labels = [f"years {first}-{last}" for first, last in ranges]
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(templates, log_level)) as executor:
+        futures = [
+            executor.submit(_run_worker_task, _collect_phase_rows, sorted(needed.intersection(range(first, last + 1))),
+                            galacticCenter_on, engine, chunk_years, eph_hash, cache_max_entries, ephemeris_file, extra_events)
+            for first, last in ranges
+        ]
+        rows_by_range = _report_worker_results(range_labels, futures)
+        if phases_out is not None:
+            for rows_by_year in rows_by_range:
+                phases_out.update({year: phase_events_from_rows(rows) for year, rows in (rows_by_year or {}).items()})
+
+        render_tasks = []
+        for timezone in (timezones or ["UTC"]):
+            zone_years = stale.get(timezone, set())
+            for (first, last), rows_by_year in zip(ranges, rows_by_range):
+                chunk_zone_years = sorted(zone_years.intersection(range(first, last + 1)))
+                if not chunk_zone_years:
+                    continue
+                if rows_by_year is None:
+                    failed.extend(calendar_label(year, timezone, timezones) for year in chunk_zone_years)
+                    continue
+                render_tasks.append((f"{timezone} years {first}-{last}", {year: rows_by_year[year] for year in chunk_zone_years}, timezone))
+        futures = [
+            executor.submit(_run_worker_task, _render_phase_rows, rows_by_year, timezone, timezones, galacticCenter_on, writer)
+            for _, rows_by_year, timezone in render_tasks
+        ]
+        for (label, rows_by_year, timezone), result in zip(render_tasks, _report_worker_results([task[0] for task in render_tasks], futures)):
+            if result is None:
+                failed.extend(calendar_label(year, timezone, timezones) for year in sorted(rows_by_year))
+            else:
+                failed.extend(result)
+    return failed
+
+def read_timezones(values):
+    """
+    Expand --timezones values into a list of valid IANA zone names.
+    Each value is a zone name or a file listing one zone per line (# starts a comment).
+    """
+    timezones = []
+    for value in values:
+        if os.path.isfile(value):
+            with open(value, 'r') as f:
+                names = [line.split("#", 1)[0].strip() for line in f]
+        else:
+            names = [name.strip() for name in value.split(",")]
+        for name in names:
+            if not name or name in timezones:
+                continue
+            if resolve_timezone(name) is None:
+                print(f"Skipping invalid timezone: {name}")
+                continue
+            timezones.append(name)
+    return timezones
+
+def write_profile(profiler):
+    """
+    Save a cProfile run as a .prof file plus a text report of the top functions.
+    """
+    import pstats
+
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    profile_file = os.path.join(OUTPUT_DIR, f"profile_{stamp}.prof")
+    report_file = os.path.join(OUTPUT_DIR, f"profile_{stamp}.txt")
+    profiler.dump_stats(profile_file)
+    with open(report_file, 'w') as f:
+        pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(PROFILE_REPORT_LINES)
+    print(f"Profile written: {profile_file} (report: {report_file})")
+
+def write_run_summary(args, failed, wall_seconds):
+    """
+    Write the run's stage timings, per-year timings and counters as JSON.
+    """
+    summary = {
+        "finished": datetime.now().isoformat(timespec="seconds"),
+        "arguments": vars(args),
+        "wall_seconds": wall_seconds,
+        "failed": failed,
+        "stages": _run_stats["stages"],
+        "counters": dict({counter: 0 for counter in RUN_COUNTERS}, **_run_stats["counters"]),
+        "years": dict(sorted(_run_stats["years"].items())),
+    }
+    try:
+        with open(SUMMARY_FILE, 'w') as f:
+            json.dump(summary, f, indent=2)
+        logging.info(f"Run summary written: {SUMMARY_FILE}")
+        print(f"Run summary written: {SUMMARY_FILE}")
+    except OSError as e:
+        logging.error(f"Failed to write run summary: {e}", exc_info=True)
+
+def run(args, log_level=logging.ERROR):
+    """
+    Generate the calendars requested on the command line and return the labels
+    of calendars that failed, or None if the run could not start.
+    """
+    if args.start_year > args.end_year:
+        logging.error("Start year cannot be greater than end year.")
+        raise ValueError("Invalid year range: Start year must be less than or equal to end year.")
+    if args.chunk_years < 1:
+        logging.error("Chunk size must be at least one year.")
+        raise ValueError("Invalid chunk size: --chunk_years must be 1 or greater.")
+    if args.workers < 1:
+        logging.error("Worker count must be at least one.")
+        raise ValueError("Invalid worker count: --workers must be 1 or greater.")
+    if args.cache_max_entries < 1:
+        logging.error("Cache size must be at least one entry.")
+        raise ValueError("Invalid cache size: --cache_max_entries must be 1 or greater.")
+
+    timezones = None
+    if args.timezones:
+        timezones = read_timezones(args.timezones)
+        if not timezones:
+            logging.error("No valid timezones given.")
+            raise ValueError("Invalid timezones: --timezones must name at least one valid IANA timezone.")
+
+    templates = None
+    if args.templates:
+        try:
+            templates = load_description_templates(args.templates)
+        except (OSError, ValueError) as e:
+            logging.error(f"Could not load templates from {args.templates}: {e}")
+            raise ValueError(f"Invalid templates file: {e}") from e
+        set_description_templates(templates)
+
+    if not os.path.exists(EPHEMERIS_FILE):
+        logging.error(f"Ephemeris file '{EPHEMERIS_FILE}' not found.")
+        print(f"Ephemeris file is missing. Please ensure '{EPHEMERIS_FILE}' is present in the working directory.")
+        return None
+
+    galacticCenter_on = (args.galactic_center == "on")
+    extra_events = tuple(sorted(set(args.extra_events or ())))
+    with stage_timer("ephemeris_hash"):
+        eph_hash = ephemeris_hash()
+
+    with stage_timer("manifest_check"):
+        manifest = load_manifest()
+        inputs_digest = manifest_inputs_digest(eph_hash, galacticCenter_on, args.engine, args.ics_writer, extra_events,
+                                               args.chunk_years)
+        if args.incremental == "on":
+            stale = stale_calendars(manifest, args.start_year, args.end_year, timezones, inputs_digest)
+        else:
+            stale = all_calendars(args.start_year, args.end_year, timezones)
+    calendar_count = len(all_calendars(args.start_year, args.end_year, timezones)) * (args.end_year - args.start_year + 1)
+    skipped = calendar_count - sum(len(years) for years in stale.values())
+    count_event("calendars_skipped", skipped)
+    if skipped:
+        print(f"{skipped} of {calendar_count} calendar(s) already up to date, skipping.")
+
+    ephemeris_file = EPHEMERIS_FILE
+    if args.ephemeris_excerpt == "on" and (any(stale.values()) or args.event_store == "on"):
+        try:
+            with stage_timer("ephemeris_excerpt"):
+                # The span engine searches whole chunks, so the excerpt must cover them
+                excerpt_years = (args.start_year, args.end_year)
+                if args.engine == "span":
+                    excerpt_years = (span_chunk(args.start_year, args.chunk_years)[0], span_chunk(args.end_year, args.chunk_years)[1])
+                ephemeris_file = ephemeris_excerpt(*excerpt_years, eph_hash)
+        except Exception as e:
+            logging.error(f"Could not excerpt {EPHEMERIS_FILE}, using the full file: {e}", exc_info=True)
+
+    cache_hash = eph_hash if args.cache == "on" else None
+    # The event store needs every year, so its phases are collected by the same pass as the calendars
+    phases_by_year = {} if args.event_store == "on" else None
+    if args.workers > 1:
+        failed = generate_years_parallel(args.start_year, args.end_year, args.workers, galacticCenter_on, args.engine, args.chunk_years,
+                                         cache_hash, args.cache_max_entries, args.ics_writer, timezones, templates, log_level, stale,
+                                         ephemeris_file, extra_events, phases_by_year)
+    else:
+        failed = generate_years(args.start_year, args.end_year, galacticCenter_on, args.engine, args.chunk_years,
+                                cache_hash, args.cache_max_entries, args.ics_writer, timezones, stale, ephemeris_file, extra_events,
+                                phases_by_year)
+
+    try:
+        record_calendars(manifest, stale, failed, timezones, inputs_digest)
+        save_manifest(manifest)
+    except OSError as e:
+        logging.error(f"Failed to update manifest {MANIFEST_FILE}: {e}", exc_info=True)
+
+    if phases_by_year is not None:
+        missing_years = [year for year in range(args.start_year, args.end_year + 1) if not phases_by_year.get(year)]
+        if missing_years:
+            logging.error(f"Not writing the event store: no events for years {', '.join(str(year) for year in missing_years)}.")
+            print(f"Failed to write the event store. Check {LOG_FILE} for details.")
+            failed.append("event store")
+        else:
+            with stage_timer("event_store"):
+                if create_event_store(phases_by_year, args.start_year, args.end_year, galacticCenter_on, eph_hash,
+                                      extra_events=extra_events) is None:
+                    print(f"Failed to write the event store. Check {LOG_FILE} for details.")
+                    failed.append("event store")
+
+    if failed:
+        print(f"{len(failed)} calendar(s) failed: {', '.join(failed)}. Check {LOG_FILE} for details.")
+    return failed
 
 def main():
     """
@@ -309,29 +1901,43 @@ def main():
     parser.add_argument("--start_year", type=int, default=2024, help="Start year for calendar generation (default: 2024).")
     parser.add_argument("--end_year", type=int, default=2048, help="End year for calendar generation (default: 2048).")
     parser.add_argument("--galactic_center", type=str, choices=["on", "off"], default="on", help="Toggle ayanamsa Galactic Center correction (default: on).")
+    parser.add_argument("--engine", type=str, choices=["span", "yearly"], default="span", help="Phase search mode: one search per chunk of years, or one per year (default: span).")
+    parser.add_argument("--chunk_years", type=int, default=SPAN_CHUNK_YEARS, help=f"Years covered by each phase search in span mode (default: {SPAN_CHUNK_YEARS}).")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes to spread the year range across (default: 1).")
+    parser.add_argument("--cache", type=str, choices=["on", "off"], default="on", help=f"Reuse phase events stored in {CACHE_FILE} (default: on).")
+    parser.add_argument("--cache_max_entries", type=int, default=CACHE_MAX_ENTRIES, help=f"Year entries kept in the cache before the least recently used are evicted (default: {CACHE_MAX_ENTRIES}).")
+    parser.add_argument("--ics_writer", type=str, choices=["stream", "calendar"], default="stream", help="ICS serializer: direct streaming writer, or the ics library's Calendar (default: stream).")
+    parser.add_argument("--incremental", type=str, choices=["on", "off"], default="on", help=f"Skip calendars whose inputs and file are unchanged since the last run, per {MANIFEST_FILE} (default: on).")
+    parser.add_argument("--extra_events", type=str, nargs="+", choices=EXTRA_EVENT_CHOICES, help="Extended events to add to the calendars: Moon sign ingresses (under both alignments, as separate event types), lunar and solar eclipses, lunar perigees/apogees, and the start of each void-of-course Moon (under both alignments) (default: none).")
+    parser.add_argument("--ephemeris_excerpt", type=str, choices=["on", "off"], default="off", help=f"Search a small copy of {EPHEMERIS_FILE} holding only the segments Moon phases need, cut in {EXCERPT_BLOCK_YEARS}-year blocks and reused from {EPHEMERIS_EXCERPT_DIR}/ (at most {EXCERPT_MAX_FILES} kept; default: off).")
+    parser.add_argument("--event_store", type=str, choices=["on", "off"], default="off", help=f"Also write every event in the year range to the columnar store in {EVENT_STORE_DIR}/ (default: off).")
+    parser.add_argument("--templates", type=str, help="JSON file of summary/description templates keyed by event index (phases 0-3, --extra_events types 4-15), overriding the defaults.")
+    parser.add_argument("--log_level", type=str, choices=["DEBUG", "INFO", "WARNING", "ERROR"], default="ERROR", help=f"Minimum level written to {LOG_FILE} (default: ERROR).")
+    parser.add_argument("--profile", action="store_true", help=f"Run under cProfile and write the profile next to the ICS files in {OUTPUT_DIR}/ (parent process only; use --workers 1 to profile everything).")
+    parser.add_argument("--timezones", type=str, nargs="+", help="IANA timezones (or files listing one per line) to render; each zone is written to output/<zone>/ (default: UTC only, in output/).")
     args = parser.parse_args()
 
-    if args.start_year > args.end_year:
-        logging.error("Start year cannot be greater than end year.")
-        raise ValueError("Invalid year range: Start year must be less than or equal to end year.")
+    log_level = getattr(logging, args.log_level)
+    logging.getLogger().setLevel(log_level)
+    logging.getLogger().addHandler(_ErrorCounter(level=logging.ERROR))
 
-    try:
-        eph = load_file("de440s.bsp")
-    except FileNotFoundError:
-        logging.error("Ephemeris file 'de440s.bsp' not found.")
-        print("Ephemeris file is missing. Please ensure 'de440s.bsp' is present in the working directory.")
-        return
+    reset_run_stats()
+    began = time.perf_counter()
+    if args.profile:
+        import cProfile
 
-    timescale = load.timescale()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            failed = run(args, log_level)
+        finally:
+            profiler.disable()
+            write_profile(profiler)
+    else:
+        failed = run(args, log_level)
 
-    for year in range(args.start_year, args.end_year + 1):
-        print(f"Generating lunar phase calendar for year {year}...")
-        galacticCenter_on = (args.galactic_center == "on")
-        phases = calculate_lunar_phases(year, eph, timescale, galacticCenter_on)
-        if phases:
-            create_ics_file(phases, year, "UTC", galacticCenter_on)
-        else:
-            print(f"Failed to generate calendar for year {year}. Check {LOG_FILE} for details.")
+    if failed is not None:
+        write_run_summary(args, failed, time.perf_counter() - began)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
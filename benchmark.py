@@ -0,0 +1,202 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import platform
+import argparse
+import resource
+import contextlib
+import io
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from skyfield.api import load_file, load
+import LunarPhaseEventsCalendarGenerator as generator
+import merge_ics_files
+
+# Default benchmark results file
+RESULTS_FILE = os.path.join(generator.OUTPUT_DIR, "benchmark_results.json")
+
+# Default parameter grid
+DEFAULT_SPANS = "1,25,500"
+DEFAULT_START_YEAR = 2024
+DEFAULT_TIMEZONES = "UTC,America/New_York"
+DEFAULT_ALIGNMENTS = "on,off"
+
+# Regression gate defaults
+DEFAULT_THRESHOLD = 0.20     # Allowed slowdown relative to the baseline (20%)
+DEFAULT_MIN_SECONDS = 0.05   # Ignore stages faster than this in both runs
+
+def fit_span(span, start_year, first_year, last_year):
+    """
+    Choose a start year so that span years fit inside the ephemeris coverage, or None if they cannot.
+    """
+    if span > last_year - first_year + 1:
+        return None
+    return max(first_year, min(start_year, last_year - span + 1))
+
+def peak_rss_mb():
+    """
+    Return this process's peak resident set size in megabytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_case(span, start_year, galacticCenter_on, timezones, writer):
+    """
+    Run every pipeline stage for one (span, alignment) case and return its timings.
+    The phase work goes through the generator's own collect_phases, so the stages
+    are the generator's stage_timer totals rather than a copy of its search loop.
+    Intended to run in a fresh process so peak RSS belongs to this case alone.
+    """
+    # A forked worker inherits the parent's loaded ephemeris and stats; start from nothing
+    generator.load_ephemeris.cache_clear()
+    generator.reset_run_stats()
+    began = time.perf_counter()
+
+    end_year = start_year + span - 1
+    with contextlib.redirect_stdout(io.StringIO()):
+        phases_by_year = generator.collect_phases(list(range(start_year, end_year + 1)), galacticCenter_on, engine="span")
+    event_count = sum(len(events) for events in phases_by_year.values())
+
+    alignment = "Galactic Center" if galacticCenter_on else "Western Occult"
+    with tempfile.TemporaryDirectory() as scratch:
+        for timezone in timezones:
+            tzinfo = generator.resolve_timezone(timezone)
+            zone_dir = os.path.join(scratch, *timezone.split("/"))
+            os.makedirs(zone_dir, exist_ok=True)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                with generator.stage_timer(f"describe:{timezone}"):
+                    generator.render_event_text.cache_clear()
+                    for events in phases_by_year.values():
+                        for event in events:
+                            generator.render_phase_event(event, tzinfo, alignment)
+                # Also records the generator's own render and file_write stages
+                with generator.stage_timer(f"serialize:{timezone}"):
+                    for year, events in phases_by_year.items():
+                        generator.create_ics_file(events, year, timezone, galacticCenter_on, writer, zone_dir)
+                with generator.stage_timer(f"merge:{timezone}"):
+                    merge_ics_files.merge_ics_files(zone_dir, os.path.join(zone_dir, "merged_lunar_phases.ics"))
+
+    total_seconds = time.perf_counter() - began
+    stages = generator.run_stats_snapshot()["stages"]
+    for name, stage in stages.items():
+        stage["events_per_second"] = event_count / stage["seconds"] if stage["seconds"] > 0 else None
+
+    return {
+        "span": span,
+        "start_year": start_year,
+        "end_year": end_year,
+        "galactic_center": "on" if galacticCenter_on else "off",
+        "writer": writer,
+        "events": event_count,
+        "total_seconds": total_seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": stages,
+    }
+
+def case_name(result):
+    """
+    Return the identifier used to match a case against the baseline.
+    """
+    return f"span={result['span']} galactic_center={result['galactic_center']} writer={result['writer']}"
+
+def compare_results(results, baseline, threshold, min_seconds):
+    """
+    Return a list of regression messages for stages slower than the baseline by more than threshold.
+    """
+    baseline_cases = {case_name(case): case for case in baseline.get("cases", [])}
+    regressions = []
+    for case in results["cases"]:
+        previous = baseline_cases.get(case_name(case))
+        if previous is None or previous.get("skipped") or case.get("skipped"):
+            continue
+        for stage, timing in case["stages"].items():
+            before = previous["stages"].get(stage)
+            if before is None:
+                continue
+            now, then = timing["seconds"], before["seconds"]
+            if max(now, then) < min_seconds:
+                continue
+            if now > then * (1 + threshold):
+                regressions.append(f"{case_name(case)} {stage}: {then:.3f}s -> {now:.3f}s (+{(now / then - 1) * 100:.0f}%)")
+    return regressions
+
+def parse_list(value):
+    """
+    Split a comma-separated option value.
+    """
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def main():
+    """
+    Run the benchmark grid, write the results as JSON and optionally gate on a baseline.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the lunar phase generator and merger pipelines.")
+    parser.add_argument("--spans", type=str, default=DEFAULT_SPANS, help=f"Comma-separated year spans to run (default: {DEFAULT_SPANS}).")
+    parser.add_argument("--start_year", type=int, default=DEFAULT_START_YEAR, help=f"First year of each span, shifted back if needed to fit the ephemeris (default: {DEFAULT_START_YEAR}).")
+    parser.add_argument("--timezones", type=str, default=DEFAULT_TIMEZONES, help=f"Comma-separated timezones to render (default: {DEFAULT_TIMEZONES}).")
+    parser.add_argument("--galactic_center", type=str, default=DEFAULT_ALIGNMENTS, help=f"Comma-separated alignment modes to run (default: {DEFAULT_ALIGNMENTS}).")
+    parser.add_argument("--ics_writer", type=str, choices=["stream", "calendar"], default="stream", help="ICS serializer to benchmark (default: stream).")
+    parser.add_argument("--output", type=str, default=RESULTS_FILE, help=f"Where to write the JSON results (default: {RESULTS_FILE}).")
+    parser.add_argument("--baseline", type=str, help="JSON results from an earlier run to compare against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help=f"Fail when a stage is slower than the baseline by more than this fraction (default: {DEFAULT_THRESHOLD}).")
+    parser.add_argument("--min_seconds", type=float, default=DEFAULT_MIN_SECONDS, help=f"Ignore stages faster than this many seconds in both runs (default: {DEFAULT_MIN_SECONDS}).")
+    args = parser.parse_args()
+
+    if not os.path.exists(generator.EPHEMERIS_FILE):
+        print(f"Ephemeris file is missing. Please ensure '{generator.EPHEMERIS_FILE}' is present in the working directory.")
+        sys.exit(2)
+
+    spans = [int(span) for span in parse_list(args.spans)]
+    timezones = parse_list(args.timezones)
+    alignments = parse_list(args.galactic_center)
+    first_year, last_year = generator.ephemeris_years(load_file(generator.EPHEMERIS_FILE), load.timescale(builtin=True))
+
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ephemeris": generator.EPHEMERIS_FILE,
+        "ephemeris_sha256": generator.ephemeris_hash(),
+        "timezones": timezones,
+        "cases": [],
+    }
+
+    for span in spans:
+        for alignment in alignments:
+            start_year = fit_span(span, args.start_year, first_year, last_year)
+            if start_year is None:
+                print(f"Skipping span={span}: {generator.EPHEMERIS_FILE} only covers {first_year}-{last_year}.")
+                results["cases"].append({"span": span, "galactic_center": alignment, "writer": args.ics_writer, "skipped": True,
+                                         "reason": f"ephemeris covers {first_year}-{last_year}"})
+                continue
+            print(f"Running span={span} ({start_year}-{start_year + span - 1}) galactic_center={alignment}...")
+            # A fresh process per case keeps peak RSS and warm caches from leaking between cases
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(run_case, span, start_year, alignment == "on", timezones, args.ics_writer).result()
+            results["cases"].append(result)
+            for stage, timing in result["stages"].items():
+                print(f"  {stage:<32} {timing['seconds']:8.3f}s  {timing['events_per_second'] or 0:12.0f} events/s")
+            print(f"  {'total':<32} {result['total_seconds']:8.3f}s  {result['events']} events, peak RSS {result['peak_rss_mb']:.1f} MB")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Benchmark results written: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold * 100:.0f}% of {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold * 100:.0f}% of {args.baseline}.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import os
+import argparse
+import logging
+import LunarPhaseEventsCalendarGenerator as generator
+
+def convert_event_store(store_dir, output_dir, timezone="UTC", start_year=None, end_year=None, writer="stream"):
+    """
+    Write one ICS file per year from a columnar event store, reading only the
+    slice of each column that belongs to the year. Returns the years that failed.
+    """
+    store = generator.open_event_store(store_dir)
+    meta = store["meta"]
+    start_year = meta["start_year"] if start_year is None else start_year
+    end_year = meta["end_year"] if end_year is None else end_year
+    if start_year < meta["start_year"] or end_year > meta["end_year"]:
+        logging.error(f"Years {start_year}-{end_year} are outside the event store's {meta['start_year']}-{meta['end_year']}.")
+        raise ValueError(f"Invalid year range: {store_dir} covers {meta['start_year']}-{meta['end_year']}.")
+
+    os.makedirs(output_dir, exist_ok=True)
+    failed = []
+    for year in range(start_year, end_year + 1):
+        columns = generator.slice_event_store(store, generator.UNIX_EPOCH.replace(year=year), generator.UNIX_EPOCH.replace(year=year + 1))
+        phases = generator.event_store_phases(columns)
+        if not phases or generator.create_ics_file(phases, year, timezone, meta["galactic_center"], writer, output_dir) is None:
+            print(f"Failed to generate calendar for year {year}. Check {generator.LOG_FILE} for details.")
+            failed.append(year)
+    return failed
+
+def main():
+    """
+    Convert a columnar event store back into yearly ICS files.
+    """
+    parser = argparse.ArgumentParser(description="Write ICS calendars from a columnar event store.")
+    parser.add_argument("--store", type=str, default=generator.EVENT_STORE_DIR, help=f"Event store directory (default: {generator.EVENT_STORE_DIR}).")
+    parser.add_argument("--output_dir", type=str, default=generator.OUTPUT_DIR, help=f"Directory for the ICS files (default: {generator.OUTPUT_DIR}).")
+    parser.add_argument("--timezone", type=str, default="UTC", help="IANA timezone for event times and local months (default: UTC).")
+    parser.add_argument("--start_year", type=int, help="First year to write (default: the store's first year).")
+    parser.add_argument("--end_year", type=int, help="Last year to write (default: the store's last year).")
+    parser.add_argument("--ics_writer", type=str, choices=["stream", "calendar"], default="stream", help="ICS serializer (default: stream).")
+    args = parser.parse_args()
+
+    if generator.resolve_timezone(args.timezone) is None:
+        raise ValueError(f"Invalid timezone: {args.timezone}")
+    failed = convert_event_store(args.store, args.output_dir, args.timezone, args.start_year, args.end_year, args.ics_writer)
+    if failed:
+        print(f"{len(failed)} calendar(s) failed: {', '.join(str(year) for year in failed)}.")
+
+if __name__ == "__main__":
+    main()
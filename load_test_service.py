@@ -0,0 +1,159 @@
+import json
+import time
+import random
+import asyncio
+import argparse
+from urllib.parse import urlencode
+import lunar_phase_service as service
+
+# Load test defaults
+DEFAULT_CONNECTIONS = 8
+DEFAULT_REQUESTS = 5000
+DEFAULT_WARMUP = 500
+DEFAULT_DISTINCT = 200  # Distinct queries in the mix; repeats are served from the response cache
+DEFAULT_SEED = 1
+
+# Query mix shared by every connection
+QUERY_TIMEZONES = ["UTC", "America/New_York", "Europe/Berlin", "Asia/Tokyo", "Australia/Sydney"]
+
+def build_queries(health, distinct, seed):
+    """
+    Build a reproducible mix of month, range and next-event queries inside the
+    indexed years, filtering only on the event types the service has indexed.
+    """
+    rng = random.Random(seed)
+    start_year, end_year = health["start_year"], health["end_year"]
+    phases = health["event_types"]
+    signs = list(service.SIGN_QUERY_NAMES)
+    queries = []
+    for _ in range(distinct):
+        year = rng.randint(start_year, end_year)
+        month = rng.randint(1, 12)
+        kind = rng.choice(["month", "range", "next"])
+        if kind == "month":
+            params = {"month": f"{year:04d}-{month:02d}", "tz": rng.choice(QUERY_TIMEZONES)}
+            path = "/events"
+        elif kind == "range":
+            params = {"start": f"{year:04d}-01-01", "end": f"{year:04d}-12-31", "phase": rng.choice(phases), "sign": rng.choice(signs)}
+            path = "/events"
+        else:
+            params = {"after": f"{year:04d}-{month:02d}-15T12:00:00Z", "phase": rng.choice(phases)}
+            path = "/next"
+        if rng.random() < 0.2:
+            params["format"] = "ics"
+        queries.append(f"{path}?{urlencode(params)}")
+    return queries
+
+async def fetch(reader, writer, target):
+    """
+    Send one keep-alive GET request and return (status, body).
+    """
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+async def client(host, port, targets, latencies, errors):
+    """
+    Issue the given requests one after another over a single connection, recording latencies.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for target in targets:
+            began = time.perf_counter()
+            status, _ = await fetch(reader, writer, target)
+            latencies.append(time.perf_counter() - began)
+            if status != 200:
+                errors.append(f"{status} {target}")
+    finally:
+        writer.close()
+
+async def run_load(host, port, queries, total, connections, seed):
+    """
+    Spread total requests drawn from queries over concurrent connections.
+    Returns (latencies, errors, wall seconds).
+    """
+    rng = random.Random(seed)
+    targets = [rng.choice(queries) for _ in range(total)]
+    latencies, errors = [], []
+    began = time.perf_counter()
+    await asyncio.gather(*(client(host, port, targets[i::connections], latencies, errors) for i in range(connections)))
+    return latencies, errors, time.perf_counter() - began
+
+def report(label, latencies, errors, wall_seconds):
+    """
+    Print and return latency percentiles and throughput for one phase of the test.
+    """
+    ordered = sorted(latencies)
+
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    result = {
+        "requests": len(ordered),
+        "errors": len(errors),
+        "requests_per_second": len(ordered) / wall_seconds if wall_seconds > 0 else None,
+        "p50_ms": percentile(0.50),
+        "p90_ms": percentile(0.90),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
+    print(f"{label}: {result['requests']} requests, {result['errors']} errors, {result['requests_per_second']:.0f} req/s, "
+          f"p50 {result['p50_ms']:.3f} ms, p90 {result['p90_ms']:.3f} ms, p99 {result['p99_ms']:.3f} ms, max {result['max_ms']:.3f} ms")
+    for error in errors[:5]:
+        print(f"  {error}")
+    return result
+
+async def load_test(args):
+    """
+    Warm the service up with a sample of the query mix, then measure the main run.
+    """
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    try:
+        _, body = await fetch(reader, writer, "/health")
+    finally:
+        writer.close()
+    health = json.loads(body)
+    print(f"Service indexes {health['events']} events for {health['start_year']}-{health['end_year']} ({health['alignment']}).")
+
+    queries = build_queries(health, args.distinct, args.seed)
+    results = {}
+    if args.warmup:
+        results["warmup"] = report("Warm-up", *await run_load(args.host, args.port, queries, args.warmup, args.connections, args.seed))
+    results["measured"] = report("Measured", *await run_load(args.host, args.port, queries, args.requests, args.connections, args.seed + 1))
+    return results
+
+def main():
+    """
+    Load test a running lunar_phase_service.py instance.
+    """
+    parser = argparse.ArgumentParser(description="Load test the lunar phase event service.")
+    parser.add_argument("--host", type=str, default=service.DEFAULT_HOST, help=f"Service address (default: {service.DEFAULT_HOST}).")
+    parser.add_argument("--port", type=int, default=service.DEFAULT_PORT, help=f"Service port (default: {service.DEFAULT_PORT}).")
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS, help=f"Concurrent keep-alive connections (default: {DEFAULT_CONNECTIONS}).")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help=f"Requests in the measured run (default: {DEFAULT_REQUESTS}).")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help=f"Requests sent before measuring (default: {DEFAULT_WARMUP}).")
+    parser.add_argument("--distinct", type=int, default=DEFAULT_DISTINCT, help=f"Distinct queries in the request mix (default: {DEFAULT_DISTINCT}).")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Random seed for the request mix (default: {DEFAULT_SEED}).")
+    parser.add_argument("--output", type=str, help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    if args.connections < 1 or args.requests < 1 or args.distinct < 1 or args.warmup < 0:
+        raise ValueError("Invalid load: --connections, --requests and --distinct must be 1 or greater, --warmup 0 or greater.")
+
+    results = asyncio.run(load_test(args))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Load test results written: {args.output}")
+
+if __name__ == "__main__":
+    main()
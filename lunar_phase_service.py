@@ -0,0 +1,385 @@
+import os
+import io
+import json
+import asyncio
+import logging
+import argparse
+import functools
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, parse_qsl
+import numpy as np
+import LunarPhaseEventsCalendarGenerator as generator
+
+# Network defaults
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8642
+
+# Default span indexed at startup
+DEFAULT_START_YEAR = 1900
+DEFAULT_END_YEAR = 2100
+
+# Response cache and request limits
+RESPONSE_CACHE_ENTRIES = 4096  # Rendered responses kept before the least recently used are dropped
+DEFAULT_LIMIT = 1000           # Events returned per response unless ?limit= says otherwise
+MAX_HEADER_LINES = 100
+
+# Phase (or extended event) and sign names accepted in queries, e.g. "full moon", "lunar perigee",
+# "moon ingress western occult", "moon void of course galactic center" or "scorpio"
+PHASE_QUERY_NAMES = {name.split(" ", 1)[1].lower().replace("(", "").replace(")", ""): index
+                     for index, name in generator.EVENT_NAMES.items()}
+SIGN_QUERY_NAMES = {name.lower(): index for index, (name, _, _) in enumerate(generator.ZODIAC_SIGNS)}
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+# The loaded event index and its response cache; see set_event_index
+_service = {"index": None, "respond": None}
+
+def epoch_us(value):
+    """
+    Convert an aware datetime to integer microseconds since the Unix epoch.
+    """
+    return (value - generator.UNIX_EPOCH) // timedelta(microseconds=1)
+
+def build_event_index(events, start_year, end_year, galacticCenter_on=True):
+    """
+    Build a sorted, array-backed index of phase events. Besides the columns for
+    every event, the index keeps the positions of the events of each phase,
+    each sign and each (phase, sign) pair, so any filtered range query is two
+    binary searches.
+    """
+    times = np.array([epoch_us(event["datetime"]) for event in events], dtype=np.int64)
+    phases = np.array([event["phase_index"] for event in events], dtype=np.int8)
+    signs = np.array([event["zodiac_index"] for event in events], dtype=np.int8)
+
+    positions = np.arange(len(events))
+    groups = {(None, None): positions}
+    for phase in generator.EVENT_NAMES:
+        groups[(phase, None)] = positions[phases == phase]
+        for sign in range(len(generator.ZODIAC_SIGNS)):
+            groups[(phase, sign)] = positions[(phases == phase) & (signs == sign)]
+    for sign in range(len(generator.ZODIAC_SIGNS)):
+        groups[(None, sign)] = positions[signs == sign]
+
+    return {
+        "events": events,
+        "times": times,
+        "phases": phases,
+        "signs": signs,
+        "corrected_longitudes": np.array([event["corrected_longitude"] for event in events], dtype=np.float64),
+        "groups": {key: (group, times[group]) for key, group in groups.items()},
+        "event_types": [name for name, phase in PHASE_QUERY_NAMES.items() if len(groups[(phase, None)])],
+        "start_year": start_year,
+        "end_year": end_year,
+        "start_us": epoch_us(generator.UNIX_EPOCH.replace(year=start_year)),
+        "end_us": epoch_us(generator.UNIX_EPOCH.replace(year=end_year + 1)),
+        "alignment": "Galactic Center" if galacticCenter_on else "Western Occult",
+    }
+
+def query_range(index, start_us, end_us, phase=None, sign=None):
+    """
+    Return the positions of the events in [start_us, end_us) matching the optional phase and sign.
+    """
+    group, times = index["groups"][(phase, sign)]
+    first, last = np.searchsorted(times, [start_us, end_us], side="left")
+    return group[first:last]
+
+def query_next(index, after_us, count=1, phase=None, sign=None):
+    """
+    Return the positions of the first count events strictly after after_us matching the optional phase and sign.
+    """
+    group, times = index["groups"][(phase, sign)]
+    first = np.searchsorted(times, after_us, side="right")
+    return group[first:first + count]
+
+def set_event_index(index, cache_entries=RESPONSE_CACHE_ENTRIES):
+    """
+    Install the event index to serve and start a fresh response cache for it.
+    """
+    _service["index"] = index
+    _service["respond"] = functools.lru_cache(maxsize=cache_entries)(render_response)
+
+class QueryError(ValueError):
+    """
+    A request that cannot be answered, with the HTTP status to report.
+    """
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def parse_time(value, tzinfo, name):
+    """
+    Parse an ISO 8601 date or datetime query value. Values without an offset are read in tzinfo.
+    """
+    try:
+        parsed = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        raise QueryError(f"Invalid {name}: '{value}' is not an ISO 8601 date or datetime.")
+    try:
+        if parsed.tzinfo is None:
+            parsed = tzinfo.localize(parsed)
+        return epoch_us(parsed)
+    except (OverflowError, ValueError):
+        # Dates at the ends of years 1-9999 can shift out of range when converted to UTC
+        raise QueryError(f"Invalid {name}: '{value}' is out of the supported date range.")
+
+def parse_month(value, tzinfo):
+    """
+    Return the [start, end) microseconds of a YYYY-MM month in tzinfo.
+    """
+    try:
+        year, month = (int(part) for part in value.split("-"))
+        start = datetime(year, month, 1)
+    except ValueError:
+        raise QueryError(f"Invalid month: '{value}' is not YYYY-MM.")
+    try:
+        end = datetime(year + month // 12, month % 12 + 1, 1)
+        return epoch_us(tzinfo.localize(start)), epoch_us(tzinfo.localize(end))
+    except (OverflowError, ValueError):
+        raise QueryError(f"Invalid month: '{value}' is out of the supported date range.")
+
+def parse_choice(value, names, name):
+    """
+    Parse a phase or sign filter given as an index or a case-insensitive name.
+    """
+    if value is None:
+        return None
+    key = value.strip().lower().replace("_", " ").replace("-", " ")
+    if key.isdigit() and int(key) in names.values():
+        return int(key)
+    if key in names:
+        return names[key]
+    raise QueryError(f"Invalid {name}: '{value}'. Expected one of: {', '.join(names)}.")
+
+def parse_count(value, default, name):
+    """
+    Parse a positive integer query value.
+    """
+    if value is None:
+        return default
+    if not value.isdigit() or int(value) < 1:
+        raise QueryError(f"Invalid {name}: '{value}' must be a positive integer.")
+    return int(value)
+
+def event_json(event, tzinfo, alignment):
+    """
+    Describe an event as a JSON-ready dictionary.
+    """
+    summary, localized_datetime, description = generator.render_phase_event(event, tzinfo, alignment)
+    return {
+        "utc": event["datetime"].replace(microsecond=0).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        "local": localized_datetime.replace(microsecond=0).isoformat(),
+        "phase": event["phase"],
+        "phase_index": event["phase_index"],
+        "longitude": event["longitude"],
+        "corrected_longitude": event["corrected_longitude"],
+        "sign": event["zodiac_name"],
+        "sign_index": event["zodiac_index"],
+        "summary": summary,
+        "description": description,
+    }
+
+def format_events(index, positions, timezone, tzinfo, output_format, extra):
+    """
+    Render the events at the given positions as a JSON document or an ICS calendar.
+    """
+    events = [index["events"][position] for position in positions]
+    if output_format == "ics":
+        buffer = io.StringIO()
+        generator.write_ics_stream(buffer, events, timezone, index["alignment"])
+        return "text/calendar; charset=utf-8", buffer.getvalue().encode('utf-8')
+    document = dict(extra, timezone=timezone, alignment=index["alignment"], count=len(events),
+                    events=[event_json(event, tzinfo, index["alignment"]) for event in events])
+    return "application/json", json.dumps(document, ensure_ascii=False).encode('utf-8')
+
+def render_response(path, query):
+    """
+    Answer one GET request from the event index and return (status, content type, body).
+    The query is a sorted tuple of (name, value) pairs so responses can be cached.
+    """
+    index = _service["index"]
+    params = dict(query)
+    try:
+        if path == "/health":
+            document = {
+                "events": len(index["events"]),
+                "start_year": index["start_year"],
+                "end_year": index["end_year"],
+                "alignment": index["alignment"],
+                "event_types": index["event_types"],
+            }
+            return 200, "application/json", json.dumps(document).encode('utf-8')
+        if path not in ("/events", "/next"):
+            raise QueryError(f"Unknown path: {path}. Use /events, /next or /health.", 404)
+
+        timezone = params.get("tz", "UTC")
+        tzinfo = generator.resolve_timezone(timezone)
+        if tzinfo is None:
+            raise QueryError(f"Invalid tz: '{timezone}' is not an IANA timezone.")
+        output_format = params.get("format", "json")
+        if output_format not in ("json", "ics"):
+            raise QueryError(f"Invalid format: '{output_format}'. Expected json or ics.")
+        phase = parse_choice(params.get("phase"), PHASE_QUERY_NAMES, "phase")
+        sign = parse_choice(params.get("sign"), SIGN_QUERY_NAMES, "sign")
+
+        if path == "/next":
+            if "after" not in params:
+                raise QueryError("Missing 'after' parameter.")
+            after_us = parse_time(params["after"], tzinfo, "after")
+            if not index["start_us"] <= after_us < index["end_us"]:
+                raise QueryError(f"'after' is outside the indexed years {index['start_year']}-{index['end_year']}.")
+            positions = query_next(index, after_us, parse_count(params.get("count"), 1, "count"), phase, sign)
+            if len(positions) == 0:
+                raise QueryError(f"No matching event before the end of {index['end_year']}.", 404)
+            return (200,) + format_events(index, positions, timezone, tzinfo, output_format, {})
+
+        if "month" in params:
+            start_us, end_us = parse_month(params["month"], tzinfo)
+        elif "start" in params and "end" in params:
+            start_us = parse_time(params["start"], tzinfo, "start")
+            end_us = parse_time(params["end"], tzinfo, "end")
+        else:
+            raise QueryError("Give either 'month' or both 'start' and 'end'.")
+        if start_us > end_us:
+            raise QueryError("'start' must not be after 'end'.")
+        if end_us <= index["start_us"] or start_us >= index["end_us"]:
+            raise QueryError(f"Range is outside the indexed years {index['start_year']}-{index['end_year']}.")
+        # A local month or range at the edge of the index can spill a few hours past it in UTC
+        start_us = max(start_us, index["start_us"])
+        end_us = min(end_us, index["end_us"])
+        limit = parse_count(params.get("limit"), DEFAULT_LIMIT, "limit")
+        positions = query_range(index, start_us, end_us, phase, sign)
+        return (200,) + format_events(index, positions[:limit], timezone, tzinfo, output_format,
+                                      {"truncated": len(positions) > limit})
+    except QueryError as e:
+        return e.status, "application/json", json.dumps({"error": str(e)}).encode('utf-8')
+
+def respond(target):
+    """
+    Answer a request target such as "/events?month=2025-03&tz=Europe/Berlin", using the response cache.
+    """
+    url = urlsplit(target)
+    return _service["respond"](url.path, tuple(sorted(parse_qsl(url.query))))
+
+def http_response(status, content_type, body, keep_alive, include_body=True):
+    """
+    Build the bytes of an HTTP/1.1 response.
+    """
+    head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + (body if include_body else b"")
+
+async def handle_connection(reader, writer):
+    """
+    Serve GET/HEAD requests on one connection until the client closes it or asks to.
+    """
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            headers = {}
+            for _ in range(MAX_HEADER_LINES):
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode('latin-1').partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            parts = request_line.decode('latin-1').split()
+            if len(parts) != 3:
+                writer.write(http_response(400, "text/plain", b"Malformed request line.", False))
+                break
+            method, target, version = parts
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            if method not in ("GET", "HEAD"):
+                writer.write(http_response(405, "text/plain", b"Only GET and HEAD are supported.", keep_alive))
+            else:
+                status, content_type, body = respond(target)
+                writer.write(http_response(status, content_type, body, keep_alive, method == "GET"))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, ValueError) as e:
+        # ValueError: a request line or header longer than the stream limit
+        logging.warning(f"Dropping connection: {e}")
+    except Exception as e:
+        logging.error(f"Error serving request: {e}", exc_info=True)
+    finally:
+        writer.close()
+
+def load_event_index(start_year, end_year, galacticCenter_on=True, use_cache=True, extra_events=()):
+    """
+    Calculate (or read from the phase-event cache) every event in the span and index them.
+    The ephemeris is loaded at most once, here.
+    """
+    eph_hash = generator.ephemeris_hash() if use_cache else None
+    phases_by_year = generator.collect_phases(list(range(start_year, end_year + 1)), galacticCenter_on, eph_hash=eph_hash,
+                                              extra_events=extra_events)
+    events = [event for year in sorted(phases_by_year) for event in phases_by_year[year]]
+    return build_event_index(events, start_year, end_year, galacticCenter_on)
+
+def load_store_index(store_dir):
+    """
+    Index the events of a columnar event store, without touching the ephemeris.
+    """
+    store = generator.open_event_store(store_dir)
+    meta = store["meta"]
+    events = generator.event_store_phases(generator.slice_event_store(store))
+    return build_event_index(events, meta["start_year"], meta["end_year"], meta["galactic_center"])
+
+async def serve(host, port):
+    """
+    Serve the installed event index until cancelled.
+    """
+    server = await asyncio.start_server(handle_connection, host, port)
+    print(f"Serving lunar phase events on http://{host}:{port}/ (Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    """
+    Load the event index once and serve range queries over HTTP.
+    """
+    parser = argparse.ArgumentParser(description="Serve lunar phase events over HTTP as JSON or ICS.")
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST, help=f"Address to listen on (default: {DEFAULT_HOST}).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT}).")
+    parser.add_argument("--start_year", type=int, default=DEFAULT_START_YEAR, help=f"First year to index (default: {DEFAULT_START_YEAR}).")
+    parser.add_argument("--end_year", type=int, default=DEFAULT_END_YEAR, help=f"Last year to index (default: {DEFAULT_END_YEAR}).")
+    parser.add_argument("--galactic_center", type=str, choices=["on", "off"], default="on", help="Toggle ayanamsa Galactic Center correction (default: on).")
+    parser.add_argument("--cache", type=str, choices=["on", "off"], default="on", help=f"Reuse phase events stored in {generator.CACHE_FILE} (default: on).")
+    parser.add_argument("--extra_events", type=str, nargs="+", choices=generator.EXTRA_EVENT_CHOICES, help="Also index moon sign ingresses, eclipses, lunar apsides and/or void-of-course starts, queryable with ?phase= (e.g. 'lunar perigee').")
+    parser.add_argument("--event_store", type=str, help="Serve the events of a columnar event store (e.g. output/lunar_phase_events) instead of calculating them; the year range and alignment come from the store.")
+    parser.add_argument("--response_cache_entries", type=int, default=RESPONSE_CACHE_ENTRIES, help=f"Rendered responses kept in memory (default: {RESPONSE_CACHE_ENTRIES}).")
+    parser.add_argument("--templates", type=str, help="JSON file of summary/description templates keyed by event index (phases 0-3, --extra_events types 4-15), overriding the defaults.")
+    args = parser.parse_args()
+
+    if args.start_year > args.end_year:
+        logging.error("Start year cannot be greater than end year.")
+        raise ValueError("Invalid year range: Start year must be less than or equal to end year.")
+    if args.response_cache_entries < 1:
+        logging.error("Response cache size must be at least one entry.")
+        raise ValueError("Invalid cache size: --response_cache_entries must be 1 or greater.")
+    if args.templates:
+        generator.set_description_templates(generator.load_description_templates(args.templates))
+    if args.event_store:
+        print(f"Indexing lunar phases from {args.event_store}...")
+        index = load_store_index(args.event_store)
+    elif not os.path.exists(generator.EPHEMERIS_FILE):
+        print(f"Ephemeris file is missing. Please ensure '{generator.EPHEMERIS_FILE}' is present in the working directory.")
+        return
+    else:
+        print(f"Indexing lunar phases for years {args.start_year}-{args.end_year}...")
+        index = load_event_index(args.start_year, args.end_year, args.galactic_center == "on", args.cache == "on",
+                                 tuple(sorted(set(args.extra_events or ()))))
+    set_event_index(index, args.response_cache_entries)
+    print(f"Indexed {len(index['events'])} events.")
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Service stopped.")
+
+if __name__ == "__main__":
+    main()
@@ -1,63 +1,278 @@
 import os
-from ics import Calendar, Event
+import json
+import heapq
+import tempfile
+import hashlib
 import logging
 
 # Directory containing the .ics files
 OUTPUT_DIR = "output"
 MERGED_FILE = os.path.join(OUTPUT_DIR, "merged_lunar_phases.ics")
 
+# Header written at the top of the merged calendar
+MERGED_PRODID = "-//Jthora//Lunar Phase Events Calendar Generator//EN"
+
+# Input files read at the same time by one k-way merge; larger overlapping groups are merged in batches
+MAX_OPEN_FILES = 64
+
+# Manifest of the inputs already merged, stored next to the merged file
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+
 # Logging setup
 LOG_FILE = os.path.join(OUTPUT_DIR, "merge_ics_error.log")
 logging.basicConfig(filename=LOG_FILE, level=logging.ERROR, format='%(asctime)s - %(message)s')
 
-def merge_ics_files(output_dir, merged_file):
+def dtstart_sort_key(value):
+    """
+    Turn a DTSTART value into a string that sorts chronologically.
+    UTC (Z) and date-only values are normalized; other values sort as written.
+    """
+    if len(value) == 8:
+        return value + "T000000"
+    return value.rstrip("Z")
+
+def read_vevent_blocks(file_path):
+    """
+    Yield (sort_key, uid, lines) for each VEVENT in an .ics file, reading it line by line.
+    Lines are returned as written (still folded) so they can be copied verbatim.
+    """
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        block = None
+        dtstart = ""
+        uid = None
+        logical = ""
+        for raw_line in f:
+            line = raw_line.rstrip("\r\n")
+            if not line:
+                continue
+            if block is None:
+                if line == "BEGIN:VEVENT":
+                    block = [line]
+                    dtstart, uid, logical = "", None, ""
+                continue
+
+            block.append(line)
+            if line[0] in (" ", "\t"):
+                logical += line[1:]
+                continue
+
+            # A new content line starts: the previous logical line is complete
+            name, _, value = logical.partition(":")
+            name = name.split(";", 1)[0].upper()
+            if name == "DTSTART":
+                dtstart = value
+            elif name == "UID":
+                uid = value
+            logical = line
+
+            if line == "END:VEVENT":
+                yield dtstart_sort_key(dtstart), uid, block
+                block = None
+
+def scan_ics_file(file_path):
+    """
+    Return (event_count, is_sorted, first_key, last_key) for an .ics file without
+    keeping its events. first_key and last_key bound its DTSTARTs (None if it has no events).
+    """
+    count = 0
+    is_sorted = True
+    previous = None
+    first_key = last_key = None
+    for key, _, _ in read_vevent_blocks(file_path):
+        if previous is not None and key < previous:
+            is_sorted = False
+        previous = key
+        first_key = key if first_key is None else min(first_key, key)
+        last_key = key if last_key is None else max(last_key, key)
+        count += 1
+    return count, is_sorted, first_key, last_key
+
+def sorted_vevent_stream(file_path, is_sorted):
+    """
+    Yield a file's VEVENT blocks in chronological order. Sorted files are
+    streamed; unsorted files (e.g. written by ics.Calendar) are sorted one file at a time.
+    """
+    if is_sorted:
+        yield from read_vevent_blocks(file_path)
+    else:
+        yield from sorted(read_vevent_blocks(file_path), key=lambda event: event[0])
+
+def overlapping_groups(inputs):
+    """
+    Group (first_key, last_key, file_path, is_sorted) inputs into runs whose
+    DTSTART ranges overlap. The groups are returned in chronological order and
+    never overlap each other, so they can be written one after another.
+    """
+    groups = []
+    group_end = None
+    for entry in sorted(inputs, key=lambda entry: (entry[0], entry[1])):
+        if groups and entry[0] <= group_end:
+            groups[-1].append(entry)
+            group_end = max(group_end, entry[1])
+        else:
+            groups.append([entry])
+            group_end = entry[1]
+    return groups
+
+def merge_group(group, scratch_dir):
+    """
+    K-way merge the files of one overlapping group. Groups larger than
+    MAX_OPEN_FILES are first merged in batches into scratch files, so no
+    more than MAX_OPEN_FILES inputs are open at once.
+    """
+    streams = [sorted_vevent_stream(file_path, is_sorted) for _, _, file_path, is_sorted in group]
+    while len(streams) > MAX_OPEN_FILES:
+        batches = [streams[i:i + MAX_OPEN_FILES] for i in range(0, len(streams), MAX_OPEN_FILES)]
+        streams = []
+        for batch in batches:
+            handle, scratch_file = tempfile.mkstemp(suffix=".vevents", dir=scratch_dir)
+            with os.fdopen(handle, 'w', encoding='utf-8', newline='') as f:
+                for _, _, lines in heapq.merge(*batch, key=lambda event: event[0]):
+                    f.write("\r\n".join(lines) + "\r\n")
+            streams.append(read_vevent_blocks(scratch_file))
+    return heapq.merge(*streams, key=lambda event: event[0])
+
+def chronological_stream(inputs, scratch_dir):
+    """
+    Yield the VEVENT blocks of many files in chronological order. Files whose
+    DTSTART ranges do not overlap (e.g. yearly calendars) are streamed one after
+    another; only overlapping files are open, or sorted in memory, together.
+    """
+    for group in overlapping_groups(inputs):
+        yield from merge_group(group, scratch_dir)
+
+def file_sha256(file_path):
+    """
+    Return the SHA-256 hex digest of a file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_merge_manifest(merged_file):
+    """
+    Return the manifest written by the last merge, or None if there is no usable one.
+    """
+    try:
+        with open(merged_file + MANIFEST_SUFFIX, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        logging.error(f"Ignoring unreadable merge manifest: {e}")
+    return None
+
+def save_merge_manifest(merged_file, input_hashes):
+    """
+    Record the inputs of the merged file and the merged file's own hash.
+    """
+    manifest = {"version": MANIFEST_VERSION, "sha256": file_sha256(merged_file), "inputs": input_hashes}
+    temp_file = merged_file + MANIFEST_SUFFIX + ".tmp"
+    with open(temp_file, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_file, merged_file + MANIFEST_SUFFIX)
+
+def files_to_merge(merged_file, input_hashes):
+    """
+    Return the input files that are not yet part of the merged file, or None
+    if the merged file has to be rebuilt because it or one of its inputs changed.
+    """
+    manifest = load_merge_manifest(merged_file)
+    if manifest is None or not os.path.exists(merged_file) or file_sha256(merged_file) != manifest["sha256"]:
+        return None
+    for name, sha256 in manifest["inputs"].items():
+        if input_hashes.get(name) != sha256:
+            return None
+    return [name for name in input_hashes if name not in manifest["inputs"]]
+
+def merge_ics_files(output_dir, merged_file, incremental=True):
     """
     Merge all .ics files in the specified directory into a single .ics file.
+    Events are streamed in chronological order: files covering separate time
+    ranges are read one after another and only overlapping files are k-way
+    merged, so open files and memory do not grow with the number of files.
+    When incremental, an unchanged merged file is extended with just the new
+    input files instead of being rebuilt from every file.
     """
     try:
         if not os.path.exists(output_dir):
             print(f"Output directory '{output_dir}' does not exist.")
             return
 
-        merged_calendar = Calendar()
         event_ids = set()  # To track unique event IDs and avoid duplication
 
         # Find all .ics files in the directory
-        ics_files = sorted([f for f in os.listdir(output_dir) if f.endswith('.ics')])
+        merged_name = os.path.basename(merged_file)
+        ics_files = sorted([f for f in os.listdir(output_dir) if f.endswith('.ics') and f != merged_name])
         if not ics_files:
             print("No .ics files found in the output directory.")
             return
 
         print(f"Found {len(ics_files)} .ics files to merge.")
 
-        for ics_file in ics_files:
+        input_hashes = {ics_file: file_sha256(os.path.join(output_dir, ics_file)) for ics_file in ics_files}
+        new_files = files_to_merge(merged_file, input_hashes) if incremental else None
+
+        merged_stream = None
+        if new_files is None:
+            new_files = ics_files
+        elif not new_files:
+            print(f"Merged .ics file is up to date: {merged_file}")
+            return
+        else:
+            print(f"Adding {len(new_files)} new .ics file(s) to the existing merged file.")
+            # The merged file was written in chronological order, so it can be streamed as is
+            merged_stream = read_vevent_blocks(merged_file)
+
+        inputs = []
+        for ics_file in new_files:
             file_path = os.path.join(output_dir, ics_file)
             try:
-                with open(file_path, 'r') as f:
-                    calendar = Calendar(f.read())
-                    for event in calendar.events:
-                        # Check for duplicate events by UID
-                        if event.uid not in event_ids:
-                            merged_calendar.events.add(event)
-                            event_ids.add(event.uid)
-                        else:
-                            logging.warning(f"Duplicate event UID skipped: {event.uid}")
+                count, is_sorted, first_key, last_key = scan_ics_file(file_path)
+                if count:
+                    inputs.append((first_key, last_key, file_path, is_sorted))
             except Exception as e:
                 logging.error(f"Error reading file {ics_file}: {e}", exc_info=True)
+                input_hashes.pop(ics_file, None)  # Retry the file on the next merge
                 print(f"Warning: Could not read file '{ics_file}', check the logs for details.")
 
         # Write the merged calendar to a single file
+        temp_file = merged_file + ".tmp"
         try:
-            with open(merged_file, 'w') as f:
-                f.writelines(merged_calendar)
-            print(f"Merged .ics file created: {merged_file}")
+            event_count = 0
+            with tempfile.TemporaryDirectory(dir=output_dir) as scratch_dir, \
+                    open(temp_file, 'w', encoding='utf-8', newline='') as f:
+                events = chronological_stream(inputs, scratch_dir)
+                if merged_stream is not None:
+                    events = heapq.merge(merged_stream, events, key=lambda event: event[0])
+                f.write(f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{MERGED_PRODID}\r\n")
+                for _, uid, lines in events:
+                    # Check for duplicate events by UID
+                    if uid is not None and uid in event_ids:
+                        logging.warning(f"Duplicate event UID skipped: {uid}")
+                        continue
+                    if uid is not None:
+                        event_ids.add(uid)
+                    f.write("\r\n".join(lines) + "\r\n")
+                    event_count += 1
+                f.write("END:VCALENDAR")
+            os.replace(temp_file, merged_file)
+            save_merge_manifest(merged_file, input_hashes)
+            print(f"Merged .ics file created: {merged_file} ({event_count} events)")
         except Exception as e:
             logging.error(f"Error writing merged file: {e}", exc_info=True)
             print("Error: Failed to write the merged .ics file. Check the logs for details.")
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
 
     except Exception as e:
         logging.error(f"Critical error during merging: {e}", exc_info=True)
         print("Critical error occurred during merging. Check the logs for details.")
 
 if __name__ == "__main__":
-    merge_ics_files(OUTPUT_DIR, MERGED_FILE)
\ No newline at end of file
+    merge_ics_files(OUTPUT_DIR, MERGED_FILE)
@@ -40,10 +40,17 @@ fi
 # Activate the virtual environment
 source "$ENV_DIR/bin/activate" || handle_error "Failed to activate virtual environment."
 
-# Upgrade pip and install dependencies
-echo "Upgrading pip and installing required dependencies..."
-pip install --upgrade pip || handle_error "Failed to upgrade pip."
-pip install -r requirements.txt || handle_error "Failed to install dependencies from requirements.txt."
+# Upgrade pip and install dependencies, unless requirements.txt is unchanged since the last install
+REQUIREMENTS_STAMP="$ENV_DIR/.requirements.sha256"
+REQUIREMENTS_HASH=$(python3 -c "import hashlib; print(hashlib.sha256(open('requirements.txt', 'rb').read()).hexdigest())")
+if [ -f "$REQUIREMENTS_STAMP" ] && [ "$(cat "$REQUIREMENTS_STAMP")" = "$REQUIREMENTS_HASH" ]; then
+    echo "Dependencies already installed from the current requirements.txt."
+else
+    echo "Upgrading pip and installing required dependencies..."
+    pip install --upgrade pip || handle_error "Failed to upgrade pip."
+    pip install -r requirements.txt || handle_error "Failed to install dependencies from requirements.txt."
+    echo "$REQUIREMENTS_HASH" > "$REQUIREMENTS_STAMP"
+fi
 
 # Download ephemeris data if not already present
 if [ ! -f "$EPHEMERIS_FILE" ]; then
@@ -0,0 +1,148 @@
+import os
+import sys
+import unittest
+from datetime import date
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.chdir(REPO_DIR)  # The generator's log file and ephemeris paths are relative to the repository
+
+import LunarPhaseEventsCalendarGenerator as generator
+
+EPHEMERIS_PATH = os.path.join(REPO_DIR, generator.EPHEMERIS_FILE)
+START_YEAR, END_YEAR = 2024, 2026
+MOON_SLOWEST_DEGREES_PER_SECOND = 11.0 / 86400  # The Moon never moves slower than this along the ecliptic
+
+# Eclipses of 2024-2026 as listed in NASA's eclipse catalogs
+EXPECTED_ECLIPSES = [
+    (date(2024, 3, 25), "🌕 Penumbral Lunar Eclipse"),
+    (date(2024, 4, 8), "🌑 Total Solar Eclipse"),
+    (date(2024, 9, 18), "🌕 Partial Lunar Eclipse"),
+    (date(2024, 10, 2), "🌑 Annular Solar Eclipse"),
+    (date(2025, 3, 14), "🌕 Total Lunar Eclipse"),
+    (date(2025, 3, 29), "🌑 Partial Solar Eclipse"),
+    (date(2025, 9, 7), "🌕 Total Lunar Eclipse"),
+    (date(2025, 9, 21), "🌑 Partial Solar Eclipse"),
+    (date(2026, 2, 17), "🌑 Annular Solar Eclipse"),
+    (date(2026, 3, 3), "🌕 Total Lunar Eclipse"),
+    (date(2026, 8, 12), "🌑 Total Solar Eclipse"),
+    (date(2026, 8, 28), "🌕 Partial Lunar Eclipse"),
+]
+
+class RefineRootsTest(unittest.TestCase):
+    def setUp(self):
+        from skyfield.api import load
+
+        self.timescale = load.timescale(builtin=True)
+
+    def test_bracketed_roots_are_found_together(self):
+        roots = np.array([2460000.3, 2460001.8, 2460003.25])
+
+        def function(times):
+            return np.sin(np.pi * (times.tt - roots))
+
+        left, right = roots - 0.4, roots + 0.1
+        found = generator.refine_roots(self.timescale, left, right, np.sin(np.pi * (left - roots)),
+                                       np.sin(np.pi * (right - roots)), function)
+        np.testing.assert_allclose(found, roots, rtol=0, atol=generator.EVENT_EPSILON_DAYS)
+
+    def test_no_brackets_give_no_roots(self):
+        empty = np.array([])
+        self.assertEqual(len(generator.refine_roots(self.timescale, empty, empty, empty, empty, None)), 0)
+
+@unittest.skipUnless(os.path.exists(EPHEMERIS_PATH), f"{generator.EPHEMERIS_FILE} is not present")
+class ExtraEventsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from skyfield import almanac
+
+        cls.eph, cls.timescale = generator.load_ephemeris(EPHEMERIS_PATH)
+        cls.start_time = cls.timescale.utc(START_YEAR, 1, 1)
+        cls.end_time = cls.timescale.utc(END_YEAR + 1, 1, 1)
+        cls.phase_times, cls.phases = almanac.find_discrete(cls.start_time, cls.end_time, almanac.moon_phases(cls.eph))
+
+    def extra_events(self, *extra_events, start_time=None, end_time=None):
+        start_time = self.start_time if start_time is None else start_time
+        end_time = self.end_time if end_time is None else end_time
+        return generator.build_extra_events(start_time, end_time, self.phase_times, self.phases, self.eph, self.timescale,
+                                            True, extra_events)
+
+    def event_jd(self, events, phase_index):
+        return np.array([self.timescale.from_datetime(event["datetime"]).tt for event in events if event["phase_index"] == phase_index])
+
+    def test_eclipses_match_the_catalog(self):
+        events = self.extra_events("eclipses")
+        self.assertEqual([(event["datetime"].date(), event["phase"]) for event in events], EXPECTED_ECLIPSES)
+
+    def test_ingresses_match_find_discrete(self):
+        from skyfield import almanac
+
+        grid_jd = generator.search_grid(self.start_time, self.end_time)
+        longitudes, galactic_longitudes = generator.moon_longitudes(self.eph, self.timescale.tt_jd(grid_jd), True)
+        times, signs, kinds = generator.find_moon_ingresses(grid_jd, longitudes, galactic_longitudes, self.eph, self.timescale)
+        for galacticCenter_on in (True, False):
+            def moon_sign(times):
+                return generator.calculate_zodiac_indices(generator.moon_longitudes(self.eph, times, galacticCenter_on)[1])
+            moon_sign.step_days = generator.EXTRA_EVENT_STEP_DAYS
+
+            expected_times, expected_signs = almanac.find_discrete(self.start_time, self.end_time, moon_sign)
+            own = kinds == generator.MOON_INGRESS_EVENTS[galacticCenter_on]
+            order = np.argsort(times.tt[own])
+            np.testing.assert_array_equal(signs[own][order], expected_signs)
+            # find_discrete stops within a millisecond of the crossing, so that is as close as the two can be compared
+            self.assertLess(np.abs(times.tt[own][order] - expected_times.tt).max(), generator.EVENT_EPSILON_DAYS)
+
+        # At each refined time the Moon sits on the boundary it crosses, to well within a millisecond of its motion
+        longitudes, galactic_longitudes = generator.moon_longitudes(self.eph, times, True)
+        longitudes = np.where(kinds == generator.MOON_INGRESS_EVENTS[True], galactic_longitudes, longitudes)
+        past_boundary = (longitudes - signs * 30.0 + 180.0) % 360.0 - 180.0
+        self.assertLess(np.abs(past_boundary).max() / MOON_SLOWEST_DEGREES_PER_SECOND, 0.2e-3)
+
+    def test_void_of_course_starts_at_the_last_aspect_before_each_ingress(self):
+        from skyfield import almanac
+
+        start_time, end_time = self.timescale.utc(START_YEAR, 1, 1), self.timescale.utc(START_YEAR, 4, 1)
+        events = self.extra_events("ingress", "void_of_course", start_time=start_time, end_time=end_time)
+
+        # Every exact major aspect, found independently with find_discrete on each body's separation step
+        padding = generator.VOID_OF_COURSE_PADDING_DAYS
+        aspect_jd = []
+        for body in generator.ASPECT_BODIES:
+            def separation_step(times, body=body):
+                observer = self.eph["earth"].at(times)
+                moon = observer.observe(self.eph["moon"]).apparent().ecliptic_latlon()[1].degrees
+                other = observer.observe(self.eph[body]).apparent().ecliptic_latlon()[1].degrees
+                return (moon - other) % 360.0 // generator.ASPECT_STEP_DEGREES
+            separation_step.step_days = 0.25
+
+            times, steps = almanac.find_discrete(self.timescale.tt_jd(start_time.tt - padding),
+                                                 self.timescale.tt_jd(end_time.tt + padding), separation_step)
+            angles = steps * generator.ASPECT_STEP_DEGREES
+            aspect_jd.extend(times.tt[np.isin(np.minimum(angles, 360 - angles), generator.MAJOR_ASPECTS)])
+        aspect_jd = np.sort(aspect_jd)
+
+        for galacticCenter_on in (True, False):
+            ingress_jd = self.event_jd(events, generator.MOON_INGRESS_EVENTS[galacticCenter_on])
+            void_jd = self.event_jd(events, generator.MOON_VOID_OF_COURSE_EVENTS[galacticCenter_on])
+            self.assertGreater(len(void_jd), 30)
+            # Each void-of-course period ends at the first ingress after it starts
+            for start, ingress in zip(void_jd, ingress_jd[np.searchsorted(ingress_jd, void_jd)]):
+                previous = ingress_jd[ingress_jd < start]
+                last_aspect = aspect_jd[aspect_jd <= ingress][-1]
+                expected = last_aspect if not len(previous) or last_aspect > previous[-1] else previous[-1]
+                # The planets are interpolated from the search grid, good to about a second
+                self.assertLess(abs(start - expected) * 86400, 2.0)
+
+    def test_void_of_course_ignores_the_search_window(self):
+        whole = self.extra_events("void_of_course")
+        split = (self.extra_events("void_of_course", end_time=self.timescale.utc(2025, 1, 1))
+                 + self.extra_events("void_of_course", start_time=self.timescale.utc(2025, 1, 1)))
+        self.assertEqual([event["phase_index"] for event in split], [event["phase_index"] for event in whole])
+        whole_jd = np.array([self.timescale.from_datetime(event["datetime"]).tt for event in whole])
+        split_jd = np.array([self.timescale.from_datetime(event["datetime"]).tt for event in split])
+        self.assertLess(np.abs(whole_jd - split_jd).max() * 86400, 1e-3)
+
+if __name__ == "__main__":
+    unittest.main()
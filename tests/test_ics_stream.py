@@ -0,0 +1,78 @@
+import io
+import os
+import sys
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.chdir(REPO_DIR)  # The generator's log file and ephemeris paths are relative to the repository
+
+import LunarPhaseEventsCalendarGenerator as generator
+
+# Reference calendar written by the original ics.Calendar serializer
+REFERENCE_YEAR = 2024
+REFERENCE_FILE = os.path.join(REPO_DIR, generator.OUTPUT_DIR, f"lunar_phases_{REFERENCE_YEAR}.ics")
+EPHEMERIS_PATH = os.path.join(REPO_DIR, generator.EPHEMERIS_FILE)
+
+def parsed_events(text):
+    """
+    Parse ICS text with ics.Calendar and return its (begin, name, description) tuples in time order.
+    """
+    from ics import Calendar
+
+    return sorted((event.begin.to('UTC').isoformat(), event.name, event.description) for event in Calendar(text).events)
+
+class FoldIcsLineTest(unittest.TestCase):
+    def test_short_line_is_not_folded(self):
+        line = "SUMMARY:" + "x" * (generator.ICS_LINE_OCTETS - len("SUMMARY:"))
+        self.assertEqual(generator.fold_ics_line(line), line + "\r\n")
+
+    def test_folded_lines_fit_the_octet_limit(self):
+        line = "DESCRIPTION:" + "abcdefghij" * 40
+        folded = generator.fold_ics_line(line)
+        physical = folded[:-2].split("\r\n")
+        self.assertGreater(len(physical), 1)
+        for part in physical:
+            self.assertLessEqual(len(part.encode('utf-8')), generator.ICS_LINE_OCTETS)
+        self.assertEqual("".join(part[1:] if i else part for i, part in enumerate(physical)), line)
+
+    def test_multibyte_characters_are_not_split(self):
+        line = "SUMMARY:" + "🌕♏💧" * 30
+        folded = generator.fold_ics_line(line)
+        physical = folded[:-2].split("\r\n")
+        for i, part in enumerate(physical):
+            self.assertLessEqual(len(part.encode('utf-8')), generator.ICS_LINE_OCTETS)
+            if i:
+                self.assertTrue(part.startswith(" "))
+        # Every chunk decoded on its own, so joining them restores the line exactly
+        self.assertEqual("".join(part[1:] if i else part for i, part in enumerate(physical)), line)
+
+class EscapeIcsTextTest(unittest.TestCase):
+    def test_special_characters_are_escaped(self):
+        self.assertEqual(generator.escape_ics_text("a\\b;c,d\ne"), "a\\\\b\\;c\\,d\\ne")
+
+    def test_line_breaks_become_escaped_newlines(self):
+        self.assertEqual(generator.escape_ics_text("a\r\nb\rc\nd"), "a\\nb\\nc\\nd")
+
+    def test_plain_text_is_unchanged(self):
+        self.assertEqual(generator.escape_ics_text("🌑 New Moon ♏ [🜄]"), "🌑 New Moon ♏ [🜄]")
+
+@unittest.skipUnless(os.path.exists(EPHEMERIS_PATH), f"{generator.EPHEMERIS_FILE} is not present")
+@unittest.skipUnless(os.path.exists(REFERENCE_FILE), f"{REFERENCE_FILE} is not present")
+class WriteIcsStreamTest(unittest.TestCase):
+    def test_streamed_year_matches_reference_calendar(self):
+        eph, timescale = generator.load_ephemeris(EPHEMERIS_PATH)
+        phases = generator.calculate_lunar_phases(REFERENCE_YEAR, eph, timescale, galacticCenter_on=True)
+        self.assertTrue(phases)
+
+        generator.set_description_templates()
+        stream = io.StringIO(newline='')
+        count = generator.write_ics_stream(stream, phases, "UTC", "Galactic Center")
+        with open(REFERENCE_FILE, 'r', encoding='utf-8') as f:
+            expected = parsed_events(f.read())
+
+        self.assertEqual(count, len(expected))
+        self.assertEqual(parsed_events(stream.getvalue()), expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import sys
+import json
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.chdir(REPO_DIR)  # The generator's log file and ephemeris paths are relative to the repository
+
+import lunar_phase_service as service
+
+class QueryRangeTest(unittest.TestCase):
+    def setUp(self):
+        # An empty index is enough to exercise query parsing without the ephemeris
+        service.set_event_index(service.build_event_index([], 2024, 2025))
+
+    def assertBadRequest(self, target, message):
+        status, content_type, body = service.respond(target)
+        self.assertEqual(status, 400)
+        self.assertIn(message, json.loads(body)["error"])
+
+    def test_last_month_of_the_calendar_is_rejected(self):
+        self.assertBadRequest("/events?month=9999-12", "out of the supported date range")
+
+    def test_times_outside_the_utc_range_are_rejected(self):
+        self.assertBadRequest("/events?start=0001-01-01&end=2025-01-01&tz=Asia/Tokyo", "out of the supported date range")
+        self.assertBadRequest("/events?start=2024-01-01&end=9999-12-31T23:30&tz=America/New_York", "out of the supported date range")
+
+    def test_malformed_month_is_rejected(self):
+        self.assertBadRequest("/events?month=2025-13", "is not YYYY-MM")
+
+    def test_indexed_month_is_answered(self):
+        status, content_type, body = service.respond("/events?month=2024-05")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["count"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
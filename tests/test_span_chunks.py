@@ -0,0 +1,67 @@
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.chdir(REPO_DIR)  # The generator's log file and ephemeris paths are relative to the repository
+
+import LunarPhaseEventsCalendarGenerator as generator
+
+GENERATOR_SCRIPT = os.path.join(REPO_DIR, "LunarPhaseEventsCalendarGenerator.py")
+EPHEMERIS_PATH = os.path.join(REPO_DIR, generator.EPHEMERIS_FILE)
+
+class SpanChunkTest(unittest.TestCase):
+    def test_chunks_start_at_multiples_of_chunk_years(self):
+        self.assertEqual(generator.span_chunk(2024, 10), (2020, 2029))
+        self.assertEqual(generator.span_chunk(2020, 10), (2020, 2029))
+        self.assertEqual(generator.span_chunk(2029, 10), (2020, 2029))
+        self.assertEqual(generator.span_chunk(2045, 25), (2025, 2049))
+
+@unittest.skipUnless(os.path.exists(EPHEMERIS_PATH), f"{generator.EPHEMERIS_FILE} is not present")
+class IncrementalRebuildTest(unittest.TestCase):
+    def setUp(self):
+        self.scratch = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.scratch, ignore_errors=True)
+
+    def generate(self, run_dir, *args):
+        subprocess.run([sys.executable, GENERATOR_SCRIPT, "--start_year", "2024", "--end_year", "2048", "--cache", "off", *args],
+                       cwd=run_dir, check=True, stdout=subprocess.DEVNULL)
+
+    def make_run_dir(self, name):
+        run_dir = os.path.join(self.scratch, name)
+        os.makedirs(os.path.join(run_dir, generator.OUTPUT_DIR))
+        os.symlink(EPHEMERIS_PATH, os.path.join(run_dir, generator.EPHEMERIS_FILE))
+        return run_dir
+
+    def read_calendars(self, run_dir):
+        output_dir = os.path.join(run_dir, generator.OUTPUT_DIR)
+        calendars = {}
+        for name in sorted(os.listdir(output_dir)):
+            if name.endswith(".ics"):
+                with open(os.path.join(output_dir, name), 'rb') as f:
+                    calendars[name] = f.read()
+        return calendars
+
+    def test_rebuild_matches_clean_run_for_any_worker_count(self):
+        clean_dir = self.make_run_dir("clean")
+        self.generate(clean_dir)
+        clean = self.read_calendars(clean_dir)
+        self.assertEqual(len(clean), 25)
+
+        # Rebuilding a few years starts the search away from --start_year and from any chunk boundary
+        for workers in ("1", "2"):
+            run_dir = os.path.join(self.scratch, f"workers_{workers}")
+            shutil.copytree(clean_dir, run_dir, symlinks=True)
+            for year in range(2042, 2046):
+                os.remove(os.path.join(run_dir, generator.OUTPUT_DIR, f"lunar_phases_{year}.ics"))
+            self.generate(run_dir, "--workers", workers)
+            self.assertEqual(self.read_calendars(run_dir), clean, f"--workers {workers}")
+
+if __name__ == "__main__":
+    unittest.main()